@@ -4,7 +4,7 @@ Utilise les variables d'environnement du fichier .env existant
 """
 
 import os
-from typing import Optional
+from typing import Optional, Tuple
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
@@ -60,6 +60,23 @@ class CacheConfig:
     redis_url: Optional[str] = None
     cache_file: str = "cache/gmaps_cache.json"
 
+@dataclass
+class HTTPConfig:
+    """Configuration du client HTTP poolé (utils/http_client.py)"""
+    # Contournement de la fuite mémoire SSL des anciens Python: réveille la
+    # boucle toutes les 2s pour nettoyer les transports fermés
+    enable_cleanup_closed: bool = False
+    # Jar de cookies réel (sinon DummyCookieJar: aucun parsing de Set-Cookie)
+    use_cookies: bool = False
+    # 0 = pas de limite par hôte (la limite globale du pool suffit)
+    limit_per_host: int = 0
+    # Hôtes pré-résolus à la création de la session (DNS chaud dès la 1re requête)
+    warmup_hosts: Tuple[str, ...] = ()
+    # IPv4 uniquement (workers cloud sans IPv6): évite les tentatives IPv6 vaines
+    force_ipv4: bool = False
+    # Boucle d'événements uvloop (libuv) si installée, appliquée au démarrage (main.py)
+    use_uvloop: bool = False
+
 class Settings:
     """Configuration globale de l'application"""
     
@@ -96,6 +113,17 @@ class Settings:
             redis_url=os.getenv("REDIS_URL"),
             cache_file=os.getenv("CACHE_FILE", "cache/gmaps_cache.json")
         )
+        
+        self.http = HTTPConfig(
+            enable_cleanup_closed=os.getenv("HTTP_ENABLE_CLEANUP_CLOSED", "false").lower() == "true",
+            use_cookies=os.getenv("HTTP_USE_COOKIES", "false").lower() == "true",
+            limit_per_host=int(os.getenv("HTTP_LIMIT_PER_HOST", "0")),
+            warmup_hosts=tuple(
+                host.strip() for host in os.getenv("HTTP_WARMUP_HOSTS", "").split(",") if host.strip()
+            ),
+            force_ipv4=os.getenv("HTTP_FORCE_IPV4", "false").lower() == "true",
+            use_uvloop=os.getenv("USE_UVLOOP", "false").lower() == "true"
+        )
     
     def validate(self) -> bool:
         """Valide que toutes les configurations requises sont présentes"""
@@ -76,7 +76,7 @@ async def demo_http_pooling():
     print("\n🔗 DÉMONSTRATION CONNECTION POOLING")
     print("=" * 50)
     
-    client = await get_http_client()
+    client = get_http_client()
     
     print("📊 Configuration du pool de connexions:")
     print(f"   - Limite totale: 100 connexions")
@@ -88,9 +88,9 @@ async def demo_http_pooling():
     stats = client.get_connection_stats()
     print(f"\n📈 État actuel: {stats['status']}")
     
-    if 'total_connections' in stats:
-        print(f"   - Connexions totales: {stats['total_connections']}")
-        print(f"   - Connexions acquises: {stats['acquired_connections']}")
+    if 'created_connections' in stats:
+        print(f"   - Connexions créées: {stats['created_connections']}")
+        print(f"   - Connexions réutilisées: {stats['reused_connections']}")
 
 
 async def demo_processors_refactored():
@@ -3,6 +3,8 @@ Interface principale de l'application d'extraction d'informations hôtelières
 Point d'entrée streamlit simplifié selon les principes Clean Code
 """
 
+import asyncio
+import logging
 import streamlit as st
 import sys
 from pathlib import Path
@@ -14,6 +16,25 @@ sys.path.append(str(Path(__file__).parent / "salles_cvent"))
 
 from ui.components import render_page_header, render_sidebar_stats, render_mode_selector
 from ui.pages import CSVExtractionPage, SingleURLExtractionPage
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def configure_event_loop():
+    """Installe la politique de boucle uvloop si demandée (USE_UVLOOP=true)
+
+    Toutes les boucles créées ensuite (asyncio.run) utilisent libuv.
+    """
+    if not settings.http.use_uvloop:
+        return
+    try:
+        import uvloop
+    except ImportError:
+        logger.warning("⚠️ uvloop non installé - boucle asyncio standard utilisée")
+        return
+    if not isinstance(asyncio.get_event_loop_policy(), uvloop.EventLoopPolicy):
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 
 def configure_streamlit_page():
@@ -72,6 +93,7 @@ def render_exports_page():
 def main():
     """Point d'entrée principal de l'application"""
     configure_streamlit_page()
+    configure_event_loop()
 
     # Navigation principale
     main_page = render_main_navigation()
@@ -8,7 +8,8 @@ import asyncio
 import os
 import time
 from datetime import datetime
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 
 import sys
 from pathlib import Path
@@ -21,12 +22,29 @@ from modules.parallel_processor_db import ParallelHotelProcessorDB, ParallelConf
 from modules.supabase_client import SupabaseError
 
 
+def _clean_csv_value(value) -> str:
+    """Normalise une cellule CSV en chaîne ('' pour les valeurs vides/NaN)"""
+    if value is None:
+        return ''
+    str_value = str(value).strip()
+    if str_value.lower() in ['nan', 'none', '']:
+        return ''
+    return str_value
+
+
+@lru_cache(maxsize=4096)
+def _parse_hotel_fields(name, address, url) -> Tuple[str, str, str]:
+    """Nettoie (name, adresse, URL) - mémoïsé pour les lignes répétées des CSV"""
+    return _clean_csv_value(name), _clean_csv_value(address), _clean_csv_value(url)
+
+
 class ExtractionServiceDB:
     """Service principal pour les extractions avec Supabase"""
 
-    def __init__(self):
+    def __init__(self, db_service: Optional[DatabaseService] = None):
         try:
-            self.db_service = DatabaseService()
+            # db_service peut être partagé (ex. instance mise en cache par l'UI)
+            self.db_service = db_service or DatabaseService()
             self.session_id = None
 
             # Restaurer automatiquement la session active si elle existe
@@ -192,19 +210,10 @@ class ExtractionServiceDB:
 
     def _extract_hotel_info_from_row(self, row) -> Dict[str, str]:
         """Extrait les informations d'hôtel depuis une ligne CSV"""
-        def clean_value(value):
-            if value is None:
-                return ''
-            str_value = str(value).strip()
-            if str_value.lower() in ['nan', 'none', '']:
-                return ''
-            return str_value
-
-        return {
-            'name': clean_value(row['name']),
-            'address': clean_value(row.get('adresse', '')),
-            'url': clean_value(row.get('URL', ''))
-        }
+        name, address, url = _parse_hotel_fields(
+            row['name'], row.get('adresse', ''), row.get('URL', '')
+        )
+        return {'name': name, 'address': address, 'url': url}
 
     def _update_realtime_table(self, placeholder):
         """Met à jour le tableau temps réel depuis Supabase"""
@@ -0,0 +1,79 @@
+"""
+Fixtures partagées pour la suite de tests
+"""
+
+from collections import namedtuple
+from contextlib import contextmanager
+from unittest.mock import Mock
+
+import pytest
+
+# Chaîne de mocks Supabase: client.table(...).insert(...).execute()
+MockedSupabase = namedtuple(
+    'MockedSupabase',
+    ['client', 'create_client', 'supabase', 'table', 'insert', 'execute']
+)
+
+
+@pytest.fixture
+def supabase_env(monkeypatch):
+    """Variables d'environnement Supabase de test"""
+    monkeypatch.setenv('SUPABASE_URL', 'https://test.supabase.co')
+    monkeypatch.setenv('SUPABASE_KEY', 'test-key')
+
+
+@pytest.fixture
+def mocked_supabase(supabase_env, monkeypatch):
+    """SupabaseClient branché sur un client Supabase mocké
+
+    Les tests configurent directement la réponse, ex.
+    ``mocked_supabase.execute.data = [{'id': 'hotel-id'}]``.
+    """
+    from modules.supabase_client import SupabaseClient
+
+    supabase = Mock()
+    table = supabase.table.return_value
+    insert = table.insert.return_value
+    execute = insert.execute.return_value
+
+    create_client = Mock(return_value=supabase)
+    monkeypatch.setattr('modules.supabase_client.create_client', create_client)
+
+    return MockedSupabase(
+        client=SupabaseClient(),
+        create_client=create_client,
+        supabase=supabase,
+        table=table,
+        insert=insert,
+        execute=execute
+    )
+
+
+@contextmanager
+def mocked_supabase_env():
+    """Env Supabase de test + create_client mocké, le temps de construire un client
+
+    Limité à la construction pour ne pas masquer la vraie config Supabase
+    aux autres tests du module.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('SUPABASE_URL', 'https://test.supabase.co')
+        mp.setenv('SUPABASE_KEY', 'test-key')
+        mp.setattr('modules.supabase_client.create_client', Mock())
+        yield
+
+
+@pytest.fixture(scope="module")
+def db_service():
+    """DatabaseService unique par module, pour les tests de mapping purs"""
+    from modules.database_service import DatabaseService
+    with mocked_supabase_env():
+        return DatabaseService()
+
+
+@pytest.fixture(scope="module")
+def sb_client():
+    """SupabaseClient unique par module, pour les tests de fonctions pures"""
+    from modules.supabase_client import SupabaseClient
+    with mocked_supabase_env():
+        return SupabaseClient()
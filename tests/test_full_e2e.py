@@ -4,11 +4,19 @@ Teste l'intégralité: CSV → Cvent (Playwright) → Google Maps → Website 
 ATTENTION: Ce test fait de VRAIES extractions et peut prendre du temps
 """
 
+import os
 import pytest
+
+# Skip au niveau module AVANT les imports lourds (Playwright, supabase, pandas)
+# pour ne pas payer leur coût à la collecte quand les tests E2E sont désactivés
+if os.getenv("SKIP_E2E_TESTS") == "1":
+    pytest.skip("Tests E2E complets désactivés", allow_module_level=True)
+
 import pandas as pd
 import asyncio
-import os
+import logging
 import time
+from collections import defaultdict
 from pathlib import Path
 from datetime import datetime
 
@@ -21,22 +29,41 @@ from modules.database_service import DatabaseService
 from modules.parallel_processor_db import ParallelHotelProcessorDB, ParallelConfig
 from services.extraction_service_db import ExtractionServiceDB
 
+# Traces de debug via logging: silencieuses par défaut, visibles avec -o log_cli=true
+logger = logging.getLogger(__name__)
+
 
 class TestFullE2E:
     """Tests End-to-End complets avec VRAIES extractions"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def test_csv_path(self):
         """Chemin vers le CSV de test réel"""
         return Path(__file__).parent / "test quelques hotels.csv"
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def small_sample_df(self, test_csv_path):
-        """DataFrame avec un très petit échantillon pour tests E2E complets"""
-        df = pd.read_csv(test_csv_path)
+        """DataFrame avec un très petit échantillon pour tests E2E complets
+
+        Parsé une seule fois par module: les tests ne le modifient pas
+        (faire un .copy() dans un test qui aurait besoin de le muter).
+        """
+        df = pd.read_csv(test_csv_path, usecols=['name', 'adresse', 'URL'], dtype='string')
         # Prendre seulement les 2 premiers hôtels pour test E2E complet
         return df.head(2)
 
+    @pytest.fixture(scope="module")
+    def supabase_client(self):
+        """Client Supabase partagé par le module pour les lectures de vérification
+
+        Une seule instance = un seul pool httpx (HTTP/2 keep-alive côté postgrest),
+        au lieu d'une nouvelle connexion TLS par test.
+        """
+        try:
+            return SupabaseClient()
+        except SupabaseError as e:
+            pytest.skip(f"Supabase inaccessible: {e}")
+
     @pytest.fixture
     def e2e_config(self):
         """Configuration optimisée pour E2E"""
@@ -50,7 +77,7 @@ class TestFullE2E:
 
     def test_prerequisites(self):
         """Vérifier que tous les prérequis sont en place"""
-        print("🔍 Vérification des prérequis...")
+        logger.info("🔍 Vérification des prérequis...")
 
         # Vérifier variables d'environnement
         required_vars = ['SUPABASE_URL', 'SUPABASE_KEY', 'GOOGLE_MAPS_API_KEY', 'OPENAI_API_KEY']
@@ -63,27 +90,23 @@ class TestFullE2E:
         if missing_vars:
             pytest.skip(f"Variables manquantes: {', '.join(missing_vars)}")
 
-        # Vérifier connexion Supabase
+        # Vérifier connexion Supabase: simple lecture (un seul aller-retour, sans écriture)
         try:
             client = SupabaseClient()
-            session_id = client.create_extraction_session("Test Prerequisites", 1, "test.csv")
-            client.client.table("extraction_sessions").delete().eq("id", session_id).execute()
-            print("✅ Supabase accessible")
+            client.client.table("extraction_sessions").select("id").limit(1).execute()
+            logger.info("✅ Supabase accessible")
         except Exception as e:
             pytest.skip(f"Supabase inaccessible: {e}")
 
-        print("✅ Tous les prérequis OK")
+        logger.info("✅ Tous les prérequis OK")
 
     @pytest.mark.slow
     @pytest.mark.asyncio
-    async def test_single_hotel_complete_workflow(self, small_sample_df, e2e_config):
+    async def test_single_hotel_complete_workflow(self, small_sample_df, e2e_config, supabase_client):
         """
         Test du workflow complet sur UN seul hôtel
         CSV → Cvent → Google Maps → Website → Supabase
         """
-        if os.getenv("SKIP_E2E_TESTS") == "1":
-            pytest.skip("Tests E2E complets désactivés")
-
         # Prendre le premier hôtel seulement
         hotel_row = small_sample_df.iloc[0]
         hotel_data = {
@@ -92,10 +115,10 @@ class TestFullE2E:
             'url': hotel_row['URL']
         }
 
-        print(f"\n🚀 TEST E2E COMPLET: {hotel_data['name']}")
-        print(f"📍 Adresse: {hotel_data['address']}")
-        print(f"🌐 URL Cvent: {hotel_data['url']}")
-        print("=" * 60)
+        logger.info(f"\n🚀 TEST E2E COMPLET: {hotel_data['name']}")
+        logger.info(f"📍 Adresse: {hotel_data['address']}")
+        logger.info(f"🌐 URL Cvent: {hotel_data['url']}")
+        logger.info("=" * 60)
 
         start_time = time.time()
 
@@ -106,10 +129,10 @@ class TestFullE2E:
 
             # 2. Créer session en DB
             session_id = db_service.create_new_session("test_full_e2e.csv", 1)
-            print(f"✅ Session créée: {session_id[:8]}...")
+            logger.info(f"✅ Session créée: {session_id[:8]}...")
 
             # 3. Traitement COMPLET avec toutes les extractions
-            print("\n🔄 Démarrage du workflow complet...")
+            logger.info("\n🔄 Démarrage du workflow complet...")
 
             final_stats = await processor.process_hotels_to_database(
                 hotels_data=[hotel_data],
@@ -122,49 +145,47 @@ class TestFullE2E:
             elapsed = time.time() - start_time
 
             # 4. Vérifications des résultats
-            print(f"\n📊 RÉSULTATS après {elapsed:.1f}s:")
-            print(f"   • Total hotels: {final_stats['total_hotels']}")
-            print(f"   • Successful: {final_stats['successful']}")
-            print(f"   • Failed: {final_stats['failed']}")
+            logger.info(f"\n📊 RÉSULTATS après {elapsed:.1f}s:")
+            logger.info(f"   • Total hotels: {final_stats['total_hotels']}")
+            logger.info(f"   • Successful: {final_stats['successful']}")
+            logger.info(f"   • Failed: {final_stats['failed']}")
 
             # 5. Vérification détaillée en DB
-            print("\n🔍 Vérification détaillée des données en DB...")
+            logger.info("\n🔍 Vérification détaillée des données en DB...")
 
             # Récupérer les données de l'hôtel
-            supabase_client = SupabaseClient()
-
             # Hotels table
             hotels_result = supabase_client.client.table("hotels").select("*").eq("session_id", session_id).execute()
             assert len(hotels_result.data) == 1, f"Expected 1 hotel, got {len(hotels_result.data)}"
 
             hotel_record = hotels_result.data[0]
-            print(f"✅ Hôtel en DB: {hotel_record['name']}")
-            print(f"   • Status: {hotel_record['extraction_status']}")
-            print(f"   • Interface type: {hotel_record.get('interface_type', 'N/A')}")
-            print(f"   • Address: {hotel_record['address']}")
-            print(f"   • Cvent URL: {hotel_record['cvent_url']}")
-            print(f"   • Salles count: {hotel_record.get('salles_count', 0)}")
+            logger.info(f"✅ Hôtel en DB: {hotel_record['name']}")
+            logger.info(f"   • Status: {hotel_record['extraction_status']}")
+            logger.info(f"   • Interface type: {hotel_record.get('interface_type', 'N/A')}")
+            logger.info(f"   • Address: {hotel_record['address']}")
+            logger.info(f"   • Cvent URL: {hotel_record['cvent_url']}")
+            logger.info(f"   • Salles count: {hotel_record.get('salles_count', 0)}")
 
             # Vérifier données Google Maps si disponibles
             gmaps_fields = ['gmaps_name', 'gmaps_rating', 'gmaps_address', 'gmaps_phone', 'gmaps_website']
             for field in gmaps_fields:
                 if hotel_record.get(field):
-                    print(f"   • {field}: {hotel_record[field]}")
+                    logger.info(f"   • {field}: {hotel_record[field]}")
 
             # Vérifier website si disponible
             if hotel_record.get('official_website'):
-                print(f"   • Official website: {hotel_record['official_website']}")
+                logger.info(f"   • Official website: {hotel_record['official_website']}")
 
             # Meeting Rooms table
             rooms_result = supabase_client.client.table("meeting_rooms").select("*").eq("hotel_id", hotel_record['id']).execute()
-            print(f"✅ {len(rooms_result.data)} salle(s) de réunion en DB")
+            logger.info(f"✅ {len(rooms_result.data)} salle(s) de réunion en DB")
 
             for i, room in enumerate(rooms_result.data, 1):
-                print(f"   • Salle {i}: {room['nom_salle']}")
-                print(f"     - Surface: {room.get('surface', 'N/A')}")
-                print(f"     - Théâtre: {room.get('capacite_theatre', 'N/A')}")
-                print(f"     - Banquet: {room.get('capacite_banquet', 'N/A')}")
-                print(f"     - U: {room.get('capacite_u', 'N/A')}")
+                logger.info(f"   • Salle {i}: {room['nom_salle']}")
+                logger.info(f"     - Surface: {room.get('surface', 'N/A')}")
+                logger.info(f"     - Théâtre: {room.get('capacite_theatre', 'N/A')}")
+                logger.info(f"     - Banquet: {room.get('capacite_banquet', 'N/A')}")
+                logger.info(f"     - U: {room.get('capacite_u', 'N/A')}")
 
             # 6. Assertions finales
             assert final_stats['total_hotels'] == 1
@@ -176,22 +197,20 @@ class TestFullE2E:
             # Si extraction Cvent réussie, doit y avoir des salles
             if hotel_record['extraction_status'] == 'success' and final_stats['successful'] == 1:
                 assert len(rooms_result.data) > 0, "Aucune salle trouvée malgré extraction réussie"
-                print("✅ Extraction Cvent réussie avec salles")
+                logger.info("✅ Extraction Cvent réussie avec salles")
 
-            print(f"\n🎉 TEST E2E COMPLET RÉUSSI en {elapsed:.1f}s!")
-            print("   Workflow: CSV → Cvent → Google Maps → Website → Supabase ✅")
+            logger.info(f"\n🎉 TEST E2E COMPLET RÉUSSI en {elapsed:.1f}s!")
+            logger.info("   Workflow: CSV → Cvent → Google Maps → Website → Supabase ✅")
 
             # Nettoyer (optionnel en mode debug)
             if os.getenv("KEEP_TEST_DATA") != "1":
                 db_service.finalize_session(session_id, success=True)
-                print("🧹 Données de test nettoyées")
+                logger.info("🧹 Données de test nettoyées")
             else:
-                print(f"🔍 Session conservée pour inspection: {session_id}")
+                logger.info(f"🔍 Session conservée pour inspection: {session_id}")
 
         except Exception as e:
-            print(f"❌ Erreur dans test E2E: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ Erreur dans test E2E: {e}")
             raise
 
     @pytest.mark.integration
@@ -201,9 +220,6 @@ class TestFullE2E:
         Test du workflow sur 2 hôtels en parallèle limité
         Pour vérifier que le traitement batch fonctionne
         """
-        if os.getenv("SKIP_E2E_TESTS") == "1":
-            pytest.skip("Tests E2E complets désactivés")
-
         # Prendre les 2 premiers hôtels
         hotels_data = []
         for _, row in small_sample_df.iterrows():
@@ -213,10 +229,10 @@ class TestFullE2E:
                 'url': row['URL']
             })
 
-        print(f"\n🚀 TEST E2E PARALLÈLE: {len(hotels_data)} hôtels")
+        logger.info(f"\n🚀 TEST E2E PARALLÈLE: {len(hotels_data)} hôtels")
         for i, hotel in enumerate(hotels_data, 1):
-            print(f"   {i}. {hotel['name']}")
-        print("=" * 60)
+            logger.info(f"   {i}. {hotel['name']}")
+        logger.info("=" * 60)
 
         # Configuration pour 2 workers
         parallel_config = ParallelConfig(
@@ -245,34 +261,32 @@ class TestFullE2E:
 
             elapsed = time.time() - start_time
 
-            print(f"\n📊 RÉSULTATS PARALLÈLES après {elapsed:.1f}s:")
-            print(f"   • Total: {final_stats['total_hotels']}")
-            print(f"   • Succès: {final_stats['successful']}")
-            print(f"   • Échecs: {final_stats['failed']}")
-            print(f"   • Vitesse: {elapsed/len(hotels_data):.1f}s par hôtel")
+            logger.info(f"\n📊 RÉSULTATS PARALLÈLES après {elapsed:.1f}s:")
+            logger.info(f"   • Total: {final_stats['total_hotels']}")
+            logger.info(f"   • Succès: {final_stats['successful']}")
+            logger.info(f"   • Échecs: {final_stats['failed']}")
+            logger.info(f"   • Vitesse: {elapsed/len(hotels_data):.1f}s par hôtel")
 
             # Vérifications
             assert final_stats['total_hotels'] == len(hotels_data)
 
             # Vérifier en DB
             session_stats = db_service.get_session_statistics(session_id)
-            print(f"✅ Stats DB: {session_stats.get('completed', 0)} complétés")
+            logger.info(f"✅ Stats DB: {session_stats.get('completed', 0)} complétés")
 
-            print(f"\n🎉 TEST PARALLÈLE RÉUSSI!")
+            logger.info(f"\n🎉 TEST PARALLÈLE RÉUSSI!")
 
         except Exception as e:
-            print(f"❌ Erreur test parallèle: {e}")
+            logger.error(f"❌ Erreur test parallèle: {e}")
             raise
 
-    def test_data_quality_validation(self, test_csv_path):
+    def test_data_quality_validation(self, supabase_client):
         """
         Test de validation de la qualité des données après extraction complète
         Vérifie que les données extraites respectent les contraintes
         """
         # Ce test examine les données réelles en DB après extraction
         try:
-            supabase_client = SupabaseClient()
-
             # Récupérer une session récente de test
             sessions = supabase_client.client.table("extraction_sessions").select("*").order("created_at", desc=True).limit(1).execute()
 
@@ -280,30 +294,37 @@ class TestFullE2E:
                 pytest.skip("Aucune session de test disponible pour validation")
 
             session_id = sessions.data[0]['id']
-            print(f"🔍 Validation des données de la session: {session_id[:8]}...")
+            logger.info(f"🔍 Validation des données de la session: {session_id[:8]}...")
 
             # Récupérer tous les hôtels de cette session
             hotels = supabase_client.client.table("hotels").select("*").eq("session_id", session_id).execute()
 
-            print(f"📊 Analyse de {len(hotels.data)} hôtel(s):")
+            logger.info(f"📊 Analyse de {len(hotels.data)} hôtel(s):")
+
+            # Une seule requête pour toutes les salles de la session, groupées par hôtel
+            hotel_ids = [hotel['id'] for hotel in hotels.data]
+            rooms_result = supabase_client.client.table("meeting_rooms").select("*").in_("hotel_id", hotel_ids).execute()
+            rooms_by_hotel = defaultdict(list)
+            for room in rooms_result.data:
+                rooms_by_hotel[room['hotel_id']].append(room)
 
             for hotel in hotels.data:
-                print(f"\n🏨 {hotel['name']}")
-                print(f"   • Status: {hotel['status']}")
-                print(f"   • Adresse: {hotel['address']}")
+                logger.info(f"\n🏨 {hotel['name']}")
+                logger.info(f"   • Status: {hotel['status']}")
+                logger.info(f"   • Adresse: {hotel['address']}")
 
                 # Vérifier contraintes de base
                 assert hotel['name'] is not None and len(hotel['name']) > 0
                 assert hotel['address'] is not None and len(hotel['address']) > 0
                 assert hotel['cvent_url'] is not None and hotel['cvent_url'].startswith('http')
 
-                # Récupérer salles de réunion
-                rooms = supabase_client.client.table("meeting_rooms").select("*").eq("hotel_id", hotel['id']).execute()
+                # Salles de réunion de cet hôtel
+                rooms = rooms_by_hotel[hotel['id']]
 
-                print(f"   • {len(rooms.data)} salle(s) de réunion")
+                logger.info(f"   • {len(rooms)} salle(s) de réunion")
 
                 # Valider structure des salles
-                for room in rooms.data:
+                for room in rooms:
                     # Nom de salle obligatoire
                     assert room['nom_salle'] is not None and len(room['nom_salle']) > 0
 
@@ -313,12 +334,12 @@ class TestFullE2E:
 
                     if hotel['status'] == 'completed':
                         # Si extraction réussie, devrait avoir au moins une capacité
-                        print(f"     - {room['nom_salle']}: {room.get('surface', 'N/A')}")
+                        logger.info(f"     - {room['nom_salle']}: {room.get('surface', 'N/A')}")
 
-            print("✅ Validation de la qualité des données OK")
+            logger.info("✅ Validation de la qualité des données OK")
 
         except Exception as e:
-            print(f"⚠️ Erreur validation données: {e}")
+            logger.warning(f"⚠️ Erreur validation données: {e}")
             # Ne pas faire échouer le test pour problème de validation
 
 
@@ -328,7 +349,7 @@ def run_quick_e2e():
     print("🚀 TEST E2E RAPIDE (1 hôtel)")
     pytest.main([
         __file__ + "::TestFullE2E::test_single_hotel_complete_workflow",
-        "-v", "-s", "--tb=short"
+        "-v", "--tb=short", "-o", "log_cli=true", "--log-cli-level=INFO"
     ])
 
 def run_full_e2e():
@@ -336,7 +357,7 @@ def run_full_e2e():
     print("🚀 TESTS E2E COMPLETS (LENT)")
     pytest.main([
         __file__,
-        "-v", "-s", "--tb=short",
+        "-v", "--tb=short", "-o", "log_cli=true", "--log-cli-level=INFO",
         "-m", "not performance"
     ])
 
@@ -352,4 +373,4 @@ if __name__ == "__main__":
         print("Usage:")
         print("  python test_full_e2e.py quick  # Test 1 hôtel complet")
         print("  python test_full_e2e.py full   # Tous les tests E2E")
-        print("  pytest test_full_e2e.py -v -s # Tests avec pytest direct")
\ No newline at end of file
+        print("  pytest test_full_e2e.py -v -o log_cli=true --log-cli-level=INFO # Tests avec pytest direct")
\ No newline at end of file
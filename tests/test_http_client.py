@@ -0,0 +1,207 @@
+"""
+Tests unitaires pour le client HTTP centralisé
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+# Import du module à tester
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.http_client import CachedResolver, HTTPClientManager
+
+
+RESOLVED = [{'hostname': 'example.com', 'host': '93.184.216.34', 'port': 443,
+             'family': 2, 'proto': 0, 'flags': 0}]
+
+
+class TestCachedResolver:
+    """Tests pour le cache DNS négatif"""
+
+    @pytest.mark.asyncio
+    async def test_failure_is_cached(self):
+        """Un échec DNS n'est pas relancé pendant NEGATIVE_TTL"""
+        base = AsyncMock()
+        base.resolve.side_effect = OSError("NXDOMAIN")
+        resolver = CachedResolver(base)
+
+        for _ in range(3):
+            with pytest.raises(OSError):
+                await resolver.resolve("Dead.Example", 443)
+
+        base.resolve.assert_awaited_once_with("dead.example", 443, 2)
+
+    @pytest.mark.asyncio
+    async def test_failure_expires(self, monkeypatch):
+        """Après NEGATIVE_TTL la résolution est retentée"""
+        clock = [1000.0]
+        monkeypatch.setattr('utils.http_client.time.monotonic', lambda: clock[0])
+        base = AsyncMock()
+        base.resolve.side_effect = [OSError("NXDOMAIN"), RESOLVED]
+        resolver = CachedResolver(base)
+
+        with pytest.raises(OSError):
+            await resolver.resolve("example.com", 443)
+        clock[0] += CachedResolver.NEGATIVE_TTL + 1
+
+        assert await resolver.resolve("example.com", 443) == RESOLVED
+
+    @pytest.mark.asyncio
+    async def test_last_good_answer_served_on_transient_failure(self, monkeypatch):
+        """La dernière réponse valide couvre un échec ponctuel"""
+        clock = [1000.0]
+        monkeypatch.setattr('utils.http_client.time.monotonic', lambda: clock[0])
+        base = AsyncMock()
+        base.resolve.side_effect = [RESOLVED, OSError("timeout")]
+        resolver = CachedResolver(base)
+
+        assert await resolver.resolve("example.com", 443) == RESOLVED
+        clock[0] += CachedResolver.POSITIVE_TTL + 1
+        assert await resolver.resolve("example.com", 443) == RESOLVED
+        assert base.resolve.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_recent_answer_served_from_cache(self):
+        """Un hôte préchauffé n'est pas re-résolu par la requête suivante"""
+        base = AsyncMock()
+        base.resolve.return_value = RESOLVED
+        resolver = CachedResolver(base)
+
+        await resolver.resolve("Example.com", 443, 0)
+        assert await resolver.resolve("example.com", 443, 0) == RESOLVED
+
+        base.resolve.assert_awaited_once_with("example.com", 443, 0)
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_pruned(self, monkeypatch):
+        """Les hôtes résolus une seule fois ne restent pas en mémoire"""
+        clock = [1000.0]
+        monkeypatch.setattr('utils.http_client.time.monotonic', lambda: clock[0])
+        base = AsyncMock()
+        base.resolve.side_effect = [RESOLVED, OSError("NXDOMAIN"), RESOLVED]
+        resolver = CachedResolver(base)
+
+        await resolver.resolve("old.example", 443)
+        with pytest.raises(OSError):
+            await resolver.resolve("dead.example", 443)
+        clock[0] += CachedResolver.GRACE_TTL + 1
+        await resolver.resolve("example.com", 443)
+
+        assert list(resolver._failures) == []
+        assert list(resolver._last_good) == [("example.com", 443, 2)]
+
+
+class TestSingleFlight:
+    """Tests pour la déduplication des GET concurrents"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_share_one_request(self):
+        """N GET identiques simultanés -> une seule requête réseau"""
+        manager = HTTPClientManager()
+        calls = []
+
+        async def fake_fetch(url, **kwargs):
+            calls.append(url)
+            await asyncio.sleep(0.01)
+            return 200, {}, b'ok'
+
+        manager._fetch = fake_fetch
+        results = await asyncio.gather(*[manager.get_shared("https://a.test/") for _ in range(5)])
+
+        assert calls == ["https://a.test/"]
+        assert results == [(200, {}, b'ok')] * 5
+        assert manager._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Un appelant en timeout ne coupe pas la requête partagée"""
+        manager = HTTPClientManager()
+
+        async def fake_fetch(url, **kwargs):
+            await asyncio.sleep(0.05)
+            return 200, {}, b'ok'
+
+        manager._fetch = fake_fetch
+        impatient = asyncio.create_task(manager.get_shared("https://a.test/"))
+        patient = asyncio.create_task(manager.get_shared("https://a.test/"))
+        await asyncio.sleep(0)
+        impatient.cancel()
+
+        assert await patient == (200, {}, b'ok')
+
+
+class TestHttp2Client:
+    """Tests pour le client HTTP/2 séparé"""
+
+    @pytest.mark.asyncio
+    async def test_total_timeout_applied(self):
+        """Le délai total de la config s'applique aussi aux requêtes httpx"""
+        manager = HTTPClientManager()
+        client = manager.get_http2_client()
+        client._total_timeout = 0.01
+
+        async def slow_request(*args, **kwargs):
+            await asyncio.sleep(1)
+
+        client._client.request = slow_request
+        with pytest.raises(asyncio.TimeoutError):
+            await client.get("https://example.com/")
+
+        assert manager.get_http2_client() is client
+        await manager.close()
+        assert client.closed
+
+
+class TestEventLoops:
+    """Tests pour la réutilisation du manager entre boucles asyncio"""
+
+    def test_connector_rebuilt_on_new_loop(self):
+        """Une session recréée sous un nouvel asyncio.run n'hérite pas du connecteur"""
+        manager = HTTPClientManager()
+
+        async def session_connector(close_manager=False):
+            session = await manager.get_session()
+            connector = manager._connector
+            await session.close()
+            if close_manager:
+                await manager.close()
+            return connector
+
+        first = asyncio.run(session_connector())
+        second = asyncio.run(session_connector(close_manager=True))
+
+        assert second is not first
+
+
+class TestClose:
+    """Tests pour la fermeture du manager"""
+
+    @pytest.mark.asyncio
+    async def test_no_session_after_close(self):
+        """Un manager fermé ne recrée pas de session"""
+        manager = HTTPClientManager()
+        await manager.get_session()
+        await manager.close()
+
+        with pytest.raises(RuntimeError):
+            await manager.get_session()
+        with pytest.raises(RuntimeError):
+            await manager.get("http://localhost/")
+
+    @pytest.mark.asyncio
+    async def test_creator_waiting_during_close_is_refused(self):
+        """Un get_session() lancé pendant close() ne ressuscite pas le manager"""
+        manager = HTTPClientManager()
+        await manager.get_session()
+
+        closing = asyncio.create_task(manager.close())
+        await asyncio.sleep(0)
+        with pytest.raises(RuntimeError):
+            await manager.get_session()
+        await closing
+
+        assert manager._session.closed
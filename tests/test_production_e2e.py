@@ -4,8 +4,8 @@ Teste l'architecture complète Supabase avec vraies données
 """
 
 import pytest
+import numpy as np
 import pandas as pd
-import asyncio
 import os
 import time
 from pathlib import Path
@@ -20,20 +20,62 @@ from modules.parallel_processor_db import ParallelHotelProcessorDB, ParallelConf
 from services.extraction_service_db import ExtractionServiceDB
 
 
+def _hotels_records(df):
+    """Convertit le DataFrame CSV en liste de dicts hôtel (name/address/url) sans iterrows"""
+    return df.rename(columns={'adresse': 'address', 'URL': 'url'})[
+        ['name', 'address', 'url']
+    ].to_dict('records')
+
+
+# Headers Cvent réels variés
+COLUMN_MAPPING_CASES = [
+    {
+        'name': 'Interface Grid classique',
+        'headers': ['Salles de réunion', 'Taille', 'En U', 'Théâtre', 'En banquet'],
+        'row': ['Salle Executive', '45 m²', '18', '35', '30'],
+        'expected_fields': ['nom_salle', 'surface', 'capacite_u', 'capacite_theatre', 'capacite_banquet']
+    },
+    {
+        'name': 'Interface Popup avec variations',
+        'headers': ['Nom', 'Taille de la salle', 'en u', 'théâtre', 'Amphithéâtre'],
+        'row': ['Salle VIP', '60 m²', '25', '50', '15'],
+        'expected_fields': ['nom_salle', 'surface', 'capacite_u', 'capacite_theatre', 'capacite_amphi']
+    }
+]
+
+# Cas avec données sales réelles
+DIRTY_HEADERS = ['Salles de réunion', 'En U', 'Théâtre', 'En banquet', 'En cocktail']
+DIRTY_DATA = [
+    ['Salle Clean', '20', '50', '40', '60'],
+    ['Salle Dirty', '-', '', 'nan', 'N/A'],
+    ['Salle Mixed', '15', '-', '30', ''],
+    ['Salle Spécial', '0', '0', '-', '45']
+]
+
+
 class TestProductionE2E:
     """Tests de production complets avec CSV réel"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def real_csv_path(self):
         """Chemin vers le CSV de test réel"""
         return Path(__file__).parent / "test quelques hotels.csv"
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def sample_hotels_df(self, real_csv_path):
-        """DataFrame avec échantillon d'hôtels réels"""
-        df = pd.read_csv(real_csv_path)
+        """DataFrame avec échantillon d'hôtels réels
+
+        Parsé une seule fois par session (seules les 3 colonnes utiles, typées
+        en string); les tests ne le modifient pas.
+        """
+        df = pd.read_csv(
+            real_csv_path,
+            usecols=['name', 'adresse', 'URL'],
+            dtype={'name': 'string', 'adresse': 'string', 'URL': 'string'},
+            engine='c'
+        )
         # Prendre un échantillon de 3 hôtels pour tests rapides
-        return df.head(3)
+        return df.head(3).reset_index(drop=True)
 
     @pytest.fixture
     def production_config(self):
@@ -75,13 +117,7 @@ class TestProductionE2E:
             assert session_id is not None
 
             # Préparer hotels
-            hotels_data = []
-            for _, row in sample_hotels_df.iterrows():
-                hotels_data.append({
-                    'name': row['name'],
-                    'address': row['adresse'],
-                    'url': row['URL']
-                })
+            hotels_data = _hotels_records(sample_hotels_df)
 
             hotel_ids = service.prepare_hotels_batch(session_id, hotels_data)
             assert len(hotel_ids) == len(hotels_data)
@@ -129,7 +165,8 @@ class TestProductionE2E:
             # Ne pas faire échouer le test si c'est juste un problème d'extraction
 
     @pytest.mark.integration
-    def test_csv_processing_flow_real(self, sample_hotels_df, production_config):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_csv_processing_flow_real(self, sample_hotels_df, production_config):
         """Test du flux CSV complet avec vraies données"""
         try:
             # Mock les extractions pour éviter les vrais appels Playwright
@@ -157,25 +194,17 @@ class TestProductionE2E:
                 session_id = service.create_new_session("test_integration.csv", len(sample_hotels_df))
 
                 # Préparer données
-                hotels_data = []
-                for _, row in sample_hotels_df.iterrows():
-                    hotels_data.append({
-                        'name': row['name'],
-                        'address': row['adresse'],
-                        'url': row['URL']
-                    })
+                hotels_data = _hotels_records(sample_hotels_df)
 
                 print(f"🔄 Test flux complet avec {len(hotels_data)} hôtels...")
 
                 # Traitement complet
-                final_stats = asyncio.run(
-                    processor.process_hotels_to_database(
-                        hotels_data=hotels_data,
-                        session_id=session_id,
-                        extract_cvent=True,
-                        extract_gmaps=False,  # Désactivé pour tests
-                        extract_website=False
-                    )
+                final_stats = await processor.process_hotels_to_database(
+                    hotels_data=hotels_data,
+                    session_id=session_id,
+                    extract_cvent=True,
+                    extract_gmaps=False,  # Désactivé pour tests
+                    extract_website=False
                 )
 
                 # Vérifications
@@ -195,75 +224,40 @@ class TestProductionE2E:
         except SupabaseError as e:
             pytest.skip(f"Supabase non accessible: {e}")
 
-    def test_column_mapping_real_data(self):
+    @pytest.mark.parametrize("case", COLUMN_MAPPING_CASES, ids=lambda c: c['name'])
+    def test_column_mapping_real_data(self, db_service, case):
         """Test mapping colonnes avec données réelles simulées"""
-        from modules.database_service import DatabaseService
-
-        # Simuler des headers Cvent réels variés
-        test_cases = [
-            {
-                'name': 'Interface Grid classique',
-                'headers': ['Salles de réunion', 'Taille', 'En U', 'Théâtre', 'En banquet'],
-                'row': ['Salle Executive', '45 m²', '18', '35', '30'],
-                'expected_fields': ['nom_salle', 'surface', 'capacite_u', 'capacite_theatre', 'capacite_banquet']
-            },
-            {
-                'name': 'Interface Popup avec variations',
-                'headers': ['Nom', 'Taille de la salle', 'en u', 'théâtre', 'Amphithéâtre'],
-                'row': ['Salle VIP', '60 m²', '25', '50', '15'],
-                'expected_fields': ['nom_salle', 'surface', 'capacite_u', 'capacite_theatre', 'capacite_amphi']
-            }
-        ]
-
-        service = DatabaseService()
-
-        for case in test_cases:
-            print(f"🧪 Test mapping: {case['name']}")
-
-            mapped = service.map_cvent_data_to_db(case['headers'], [case['row']])
-
-            assert len(mapped) == 1
-            room = mapped[0]
-
-            # Vérifier que tous les champs attendus sont présents
-            for field in case['expected_fields']:
-                assert field in room, f"Champ {field} manquant dans {case['name']}"
-                assert room[field] is not None, f"Champ {field} vide dans {case['name']}"
-
-            print(f"   ✅ {len(case['expected_fields'])} champs mappés correctement")
-
-    def test_data_cleaning_edge_cases(self):
-        """Test nettoyage données avec cas limites"""
-        service = DatabaseService()
-
-        # Cas avec données sales réelles
-        headers = ['Salles de réunion', 'En U', 'Théâtre', 'En banquet', 'En cocktail']
-        dirty_data = [
-            ['Salle Clean', '20', '50', '40', '60'],
-            ['Salle Dirty', '-', '', 'nan', 'N/A'],
-            ['Salle Mixed', '15', '-', '30', ''],
-            ['Salle Spécial', '0', '0', '-', '45']
-        ]
-
-        mapped_rooms = service.map_cvent_data_to_db(headers, dirty_data)
-
-        assert len(mapped_rooms) == 4
-
-        # Salle Clean: toutes les données
-        assert mapped_rooms[0]['capacite_u'] == '20'
-        assert mapped_rooms[0]['capacite_theatre'] == '50'
-
-        # Salle Dirty: données nettoyées (champs manquants)
-        dirty_room = mapped_rooms[1]
-        assert dirty_room['nom_salle'] == 'Salle Dirty'
-        # Les champs sales ne doivent pas être présents ou être vides
-
-        # Salle Mixed: mélange
-        mixed_room = mapped_rooms[2]
-        assert mixed_room['capacite_u'] == '15'
-        assert mixed_room['capacite_banquet'] == '30'
-
-        print("✅ Nettoyage des données OK - Cas limites gérés")
+        mapped = db_service.map_cvent_data_to_db(case['headers'], [case['row']])
+
+        assert len(mapped) == 1
+        room = mapped[0]
+
+        # Vérifier que tous les champs attendus sont présents
+        for field in case['expected_fields']:
+            assert field in room, f"Champ {field} manquant dans {case['name']}"
+            assert room[field] is not None, f"Champ {field} vide dans {case['name']}"
+
+    def test_data_cleaning_edge_cases(self, db_service):
+        """Test nettoyage données avec cas limites
+
+        Oracle pandas: les colonnes Cvent renommées vers la DB, les cellules
+        vides écartées; les autres valeurs ('-', 'nan', 'N/A') sont conservées
+        telles quelles au mapping (nettoyées plus tard à l'insertion).
+        """
+        mapped_rooms = db_service.map_cvent_data_to_db(DIRTY_HEADERS, DIRTY_DATA)
+
+        expected = (
+            pd.DataFrame(DIRTY_DATA, columns=DIRTY_HEADERS)
+            .rename(columns=DatabaseService.COLUMN_MAPPING)
+            .replace('', np.nan)
+        )
+        mapped = pd.DataFrame(mapped_rooms)
+
+        assert list(mapped.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(mapped, expected)
+        # Valeurs de référence, indépendantes de l'oracle
+        assert mapped.loc[0, 'capacite_u'] == '20'
+        assert mapped.loc[2, ['capacite_u', 'capacite_banquet']].tolist() == ['15', '30']
 
     @pytest.mark.performance
     def test_batch_processing_performance(self, sample_hotels_df):
@@ -279,13 +273,7 @@ class TestProductionE2E:
 
             # Test insertion batch
             batch_start = time.time()
-            hotels_data = []
-            for _, row in sample_hotels_df.iterrows():
-                hotels_data.append({
-                    'name': row['name'],
-                    'address': row['adresse'],
-                    'url': row['URL']
-                })
+            hotels_data = _hotels_records(sample_hotels_df)
 
             hotel_ids = service.prepare_hotels_batch(session_id, hotels_data)
             batch_time = time.time() - batch_start
@@ -312,13 +300,9 @@ class TestProductionE2E:
             session_id = service.create_new_session("test_error.csv", len(sample_hotels_df))
 
             # Simuler une erreur sur un hôtel
-            hotels_data = []
-            for i, (_, row) in enumerate(sample_hotels_df.iterrows()):
-                hotels_data.append({
-                    'name': row['name'] if i != 1 else None,  # Erreur sur le 2e
-                    'address': row['adresse'],
-                    'url': row['URL']
-                })
+            hotels_data = _hotels_records(sample_hotels_df)
+            if len(hotels_data) > 1:
+                hotels_data[1]['name'] = None  # Erreur sur le 2e
 
             # L'insertion devrait échouer proprement
             try:
@@ -0,0 +1,155 @@
+"""
+Tests unitaires pour les helpers de la page Streamlit
+"""
+
+import codecs
+from unittest.mock import Mock
+
+import pandas as pd
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import pytest
+
+# Import du module à tester
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ui.pages import (
+    _EXPORT_PAGE_SIZE, _NoExportRows, _build_session_csv, _detect_encoding, _fetch_consolidated,
+    _fetch_consolidated_concurrently, _read_csv
+)
+
+
+class TestDetectEncoding:
+    """Tests pour la détection d'encodage des CSV uploadés"""
+
+    def test_utf8(self):
+        """Un CSV UTF-8 sans BOM est lu en UTF-8"""
+        assert _detect_encoding("Hôtel Le Régent".encode('utf-8')) == 'utf-8'
+
+    def test_utf8_bom(self):
+        """Le BOM UTF-8 est retiré à la lecture"""
+        assert _detect_encoding(codecs.BOM_UTF8 + b"name") == 'utf-8-sig'
+
+    @pytest.mark.parametrize("name", ["Hôtel Le Régent", "Café Crème", "Château d'Œuf — Salle Été"])
+    def test_cp1252_accents(self, name):
+        """Un export Excel Windows (cp1252) garde ses accents français"""
+        raw = f"name,adresse,URL\n{name},1 rue de la Paix,https://example.com\n".encode('cp1252')
+
+        df = _read_csv(raw, _detect_encoding(raw))
+
+        assert df.loc[0, 'name'] == name
+
+    def test_latin1_fallback(self):
+        """Octets non définis en cp1252: repli latin-1, qui décode tout"""
+        assert _detect_encoding(b"name\n\x81\xe9\n") == 'latin-1'
+
+
+class FakeExportQuery:
+    """Requête PostgREST minimale: enregistre le tri et sert les lignes par plage"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.orders = []
+
+    def select(self, *args):
+        return self
+
+    def in_(self, column, values):
+        return self
+
+    def order(self, column):
+        self.orders.append(column)
+        return self
+
+    def range(self, start, end):
+        self.page = self.rows[start:end + 1]
+        return self
+
+    def execute(self):
+        return Mock(data=self.page)
+
+
+class TestFetchConsolidated:
+    """Tests pour la récupération groupée de consolidated_export"""
+
+    def test_pages_ordered_by_unique_key(self):
+        """Pagination triée sur une clé unique, lignes regroupées par session"""
+        rows = [
+            {'session_id': sid, 'hotel_id': f"h{i}", 'room_id': f"r{i}"}
+            for i, sid in enumerate(['s-a'] * _EXPORT_PAGE_SIZE + ['s-b'] * 3)
+        ]
+        query = FakeExportQuery(rows)
+        supabase = Mock()
+        supabase.client.table.return_value = query
+
+        rows_by_session = _fetch_consolidated(supabase, ('s-a', 's-b'))
+
+        assert query.orders[:3] == ['session_id', 'hotel_id', 'room_id']
+        assert len(rows_by_session['s-a']) == _EXPORT_PAGE_SIZE
+        assert [row['room_id'] for row in rows_by_session['s-b']] == [
+            f"r{i}" for i in range(_EXPORT_PAGE_SIZE, _EXPORT_PAGE_SIZE + 3)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_fallback_paginates_each_session(self):
+        """Le repli par session lit toutes les pages, pas seulement les 1000 premières lignes"""
+        rows = [{'session_id': 's-big', 'room_id': f"r{i}"} for i in range(_EXPORT_PAGE_SIZE + 3)]
+
+        async def consolidated_export(request):
+            offset, limit = int(request.query['offset']), int(request.query['limit'])
+            return web.json_response(rows[offset:offset + limit])
+
+        app = web.Application()
+        app.router.add_get('/rest/v1/consolidated_export', consolidated_export)
+        async with TestServer(app) as server:
+            rows_by_session = await _fetch_consolidated_concurrently(
+                str(server.make_url('/')), 'test-key', ('s-big',)
+            )
+
+        assert rows_by_session['s-big'] == rows
+
+
+class TestBuildSessionCsv:
+    """Tests pour l'export CSV d'une session depuis la vue consolidée"""
+
+    ROWS = [
+        {'session_id': 'csv-s', 'hotel_name': 'Hôtel, Le Régent', 'gmaps_is_closed': False,
+         'nom_salle': 'Salle 1', 'capacite_theatre': 30.0},
+        {'session_id': 'csv-s', 'hotel_name': 'Café Crème', 'gmaps_is_closed': True,
+         'nom_salle': None, 'capacite_theatre': None},
+        {'session_id': 'csv-s', 'hotel_name': 'Hôtel Vide', 'gmaps_is_closed': None,
+         'nom_salle': '', 'capacite_theatre': 3.0},
+    ]
+
+    def _db_service(self):
+        db_service = Mock()
+        query = FakeExportQuery(self.ROWS)
+        db_service.client.client.table.return_value = query
+        return db_service
+
+    def test_same_format_as_pandas_export(self):
+        """Même octets que DataFrame.to_csv (format du repli export_session_to_csv)"""
+        csv = _build_session_csv(self._db_service(), 'csv-s', True)
+
+        assert csv == pd.DataFrame(self.ROWS).to_csv(index=False)
+
+    def test_without_empty_rooms(self):
+        """Les hôtels sans salle (NA ou '') sont exclus"""
+        csv = _build_session_csv(self._db_service(), 'csv-s', False)
+
+        assert csv == pd.DataFrame(self.ROWS[:1]).to_csv(index=False)
+
+    def test_missing_rows_not_cached(self):
+        """Une session sans ligne lève une exception, donc rien n'est mis en cache"""
+        db_service = Mock()
+        db_service.client.client.table.return_value = FakeExportQuery([])
+        with pytest.raises(_NoExportRows):
+            _build_session_csv(db_service, 'csv-late', True)
+
+        _fetch_consolidated.clear()
+        rows = [dict(row, session_id='csv-late') for row in self.ROWS]
+        db_service.client.client.table.return_value = FakeExportQuery(rows)
+
+        assert _build_session_csv(db_service, 'csv-late', True) == pd.DataFrame(rows).to_csv(index=False)
@@ -2,42 +2,60 @@
 Composants UI réutilisables pour l'interface Streamlit
 """
 
+from dataclasses import dataclass
+
 import streamlit as st
 
+# Textes statiques (construits une fois à l'import, pas à chaque rerun)
+_PAGE_TITLE = "🏨 Extracteur d'Informations Hôtelières"
+
+_SIDEBAR_FEATURES_MD = """
+**Extractions disponibles :**
+- ✅ Salles de conférence (Cvent)
+- ✅ Informations Google Maps
+- ✅ Site web officiel (OpenAI GPT-4o-mini)
+
+**🏢 Aleou - Solution d'extraction hôtelière :**
+- Extraction multi-sources optimisée
+- Interface client simplifiée  
+- Traitement haute performance
+"""
+
+_CSV_FORMAT_MD = """
+Votre fichier CSV doit contenir **exactement** ces colonnes :
+- `name` : Nom de l'hôtel
+- `adresse` : Adresse complète de l'hôtel
+- `URL` : URL Cvent de l'hôtel
+
+**Exemple :**
+```
+name,adresse,URL
+Hôtel Example,123 Rue de la Paix Paris,https://cvent.com/venue/example
+```
+"""
+
 
 def render_page_header():
     """Affiche le header principal de l'application"""
-    st.title("🏨 Extracteur d'Informations Hôtelières")
+    st.title(_PAGE_TITLE)
     st.markdown("---")
 
 
 def render_sidebar_stats():
     """Affiche les statistiques dans la sidebar"""
     st.header("📋 Fonctionnalités")
-    st.markdown("""
-    **Extractions disponibles :**
-    - ✅ Salles de conférence (Cvent)
-    - ✅ Informations Google Maps
-    - ✅ Site web officiel (OpenAI GPT-4o-mini)
-    
-    **🏢 Aleou - Solution d'extraction hôtelière :**
-    - Extraction multi-sources optimisée
-    - Interface client simplifiée  
-    - Traitement haute performance
-    """)
+    st.markdown(_SIDEBAR_FEATURES_MD)
     
     st.markdown("---")
     st.header("📊 Statistiques")
     
     # Initialiser les stats si nécessaire
-    if 'extraction_stats' not in st.session_state:
-        st.session_state.extraction_stats = {
-            'total_hotels': 0,
-            'successful_extractions': 0,
-            'failed_extractions': 0
-        }
-    
-    stats = st.session_state.extraction_stats
+    stats = st.session_state.setdefault('extraction_stats', {
+        'total_hotels': 0,
+        'successful_extractions': 0,
+        'failed_extractions': 0
+    })
+    
     col1, col2 = st.columns(2)
     
     with col1:
@@ -65,18 +83,7 @@ def render_mode_selector():
 def render_csv_format_instructions():
     """Affiche les instructions pour le format CSV"""
     with st.expander("📋 Format requis du fichier CSV"):
-        st.markdown("""
-        Votre fichier CSV doit contenir **exactement** ces colonnes :
-        - `name` : Nom de l'hôtel
-        - `adresse` : Adresse complète de l'hôtel
-        - `URL` : URL Cvent de l'hôtel
-        
-        **Exemple :**
-        ```
-        name,adresse,URL
-        Hôtel Example,123 Rue de la Paix Paris,https://cvent.com/venue/example
-        ```
-        """)
+        st.markdown(_CSV_FORMAT_MD)
 
 
 def render_csv_uploader():
@@ -120,40 +127,82 @@ def render_extraction_options():
     }
 
 
-def render_progress_bar(current: int, total: int, current_hotel: str):
-    """Affiche une barre de progression avec le statut actuel"""
+def render_progress_bar(current: int, total: int, current_hotel: str,
+                        placeholder=None, bar=None):
+    """Affiche une barre de progression avec le statut actuel
+
+    Pour mettre à jour les mêmes éléments tout au long d'une extraction,
+    l'appelant crée bar (st.progress) et placeholder (st.empty) une fois
+    pendant le run et les repasse à chaque appel; sinon ils sont créés ici.
+    Les DeltaGenerators ne sont valables que pour le run qui les a créés:
+    ils ne sont jamais conservés dans st.session_state.
+    """
+    if bar is None:
+        bar = st.progress(0)
+    if placeholder is None:
+        placeholder = st.empty()
+    
     progress = current / total if total > 0 else 0
-    st.progress(progress)
-    return st.empty().text(f"Traitement de {current_hotel} ({current}/{total})")
+    bar.progress(progress)
+    placeholder.text(f"Traitement de {current_hotel} ({current}/{total})")
+    return placeholder
+
+
+@dataclass(frozen=True, slots=True)
+class ConsolidationView:
+    """Champs dérivés des stats de consolidation, lus une seule fois par rerun"""
+    total: int
+    ok: int
+    fail: int
+    rooms: int
+    rate: float
+    status: str  # 'ok' | 'partial' | 'fail'
+    
+    @classmethod
+    def from_stats(cls, stats) -> "ConsolidationView":
+        ok = stats['successful_extractions']
+        fail = stats['failed_extractions']
+        status = 'ok' if ok and not fail else 'partial' if ok else 'fail'
+        return cls(
+            total=stats['total_hotels'],
+            ok=ok,
+            fail=fail,
+            rooms=stats['total_rooms'],
+            rate=stats.get('success_rate', 0),
+            status=status
+        )
+
+
+# Statut -> (fonction d'affichage, message)
+_CONSOLIDATION_STATUS_MESSAGES = {
+    'ok': (st.success, "🎉 Toutes les extractions ont réussi ! {view.rooms} salles extraites."),
+    'partial': (st.warning, "⚠️ {view.ok} réussies, {view.fail} échouées"),
+    'fail': (st.error, "❌ Aucune extraction n'a réussi"),
+}
 
 
-def render_consolidation_metrics(stats):
+def render_consolidation_metrics(view: ConsolidationView):
     """Affiche les métriques de consolidation"""
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total hôtels", stats['total_hotels'])
+        st.metric("Total hôtels", view.total)
     
     with col2:
         st.metric(
             "Extractions réussies", 
-            stats['successful_extractions'],
-            delta=f"{stats.get('success_rate', 0):.1f}%"
+            view.ok,
+            delta=f"{view.rate:.1f}%"
         )
     
     with col3:
-        st.metric("Extractions échouées", stats['failed_extractions'])
+        st.metric("Extractions échouées", view.fail)
     
     with col4:
-        st.metric("Total salles extraites", stats['total_rooms'])
+        st.metric("Total salles extraites", view.rooms)
 
 
-def render_consolidation_status_message(stats):
+def render_consolidation_status_message(view: ConsolidationView):
     """Affiche le message de statut global de la consolidation"""
-    if stats['successful_extractions'] > 0:
-        if stats['failed_extractions'] == 0:
-            st.success(f"🎉 Toutes les extractions ont réussi ! {stats['total_rooms']} salles extraites.")
-        else:
-            st.warning(f"⚠️ {stats['successful_extractions']} réussies, {stats['failed_extractions']} échouées")
-    else:
-        st.error("❌ Aucune extraction n'a réussi") 
\ No newline at end of file
+    render, message = _CONSOLIDATION_STATUS_MESSAGES[view.status]
+    render(message.format(view=view))
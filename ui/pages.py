@@ -3,10 +3,16 @@ Pages de l'application Streamlit
 Gère les workflows d'extraction CSV et URL unique
 """
 
+import asyncio
+import codecs
+import io
 import streamlit as st
 import pandas as pd
 import os
+import aiohttp
+import httpx
 from datetime import datetime
+from postgrest.exceptions import APIError
 
 from ui.components import (
     render_csv_format_instructions, 
@@ -16,12 +22,247 @@ from ui.components import (
 from services.extraction_service_db import ExtractionServiceDB
 
 
+# BOMs reconnus en tête de fichier (UTF-32 avant UTF-16: même préfixe \xff\xfe)
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+_ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# Seules colonnes exploitées par l'extraction
+_CSV_COLUMNS = ('name', 'adresse', 'URL')
+_REQUIRED_COLUMNS = frozenset(_CSV_COLUMNS)
+
+# Emoji affiché pour chaque statut de session d'extraction
+_STATUS_EMOJI = {
+    'completed': '✅',
+    'processing': '⏳',
+    'failed': '❌'
+}
+
+
+def _detect_encoding(raw: bytes) -> str:
+    """Détecte l'encodage du CSV à partir du BOM puis d'un échantillon de 64 Ko
+
+    Ordre: BOM, UTF-8 strict, cp1252 strict, latin-1.
+    """
+    for bom, encoding in _BOM_ENCODINGS:
+        if raw.startswith(bom):
+            return encoding
+    
+    sample = raw[:_ENCODING_SAMPLE_SIZE]
+    try:
+        # final=False: tolère un caractère multi-octets coupé en fin d'échantillon
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    
+    # Exports Excel/Windows français: cp1252, puis latin-1 qui décode tous les octets
+    # (les détecteurs statistiques confondent cp1252 avec cp1250/cp775 sur les accents)
+    try:
+        sample.decode('cp1252')
+        return 'cp1252'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+def _read_csv(file_bytes: bytes, encoding: str) -> pd.DataFrame:
+    """Lit uniquement les colonnes utiles, via le moteur pyarrow si disponible"""
+    try:
+        return pd.read_csv(
+            io.BytesIO(file_bytes), encoding=encoding, engine='pyarrow', usecols=list(_CSV_COLUMNS)
+        )
+    except Exception:
+        # pyarrow absent, colonnes manquantes (signalées ensuite par la validation)
+        # ou CSV mal formé: repli sur le moteur C, plus tolérant
+        return pd.read_csv(
+            io.BytesIO(file_bytes), encoding=encoding, usecols=lambda col: col in _CSV_COLUMNS
+        )
+
+
+def _parse_csv(file_bytes: bytes, encoding: str) -> pd.DataFrame:
+    """Parse le CSV uploadé (résultat conservé par file_id dans st.session_state)"""
+    try:
+        return _read_csv(file_bytes, encoding)
+    except UnicodeDecodeError:
+        # L'échantillon ne reflétait pas tout le fichier: latin-1 décode tous les octets
+        return _read_csv(file_bytes, 'latin-1')
+
+
+def _missing_columns(columns) -> list:
+    """Colonnes requises absentes du CSV"""
+    missing = _REQUIRED_COLUMNS.difference(columns)
+    # Ordre stable pour le message d'erreur
+    return [col for col in _CSV_COLUMNS if col in missing]
+
+
+@st.cache_data(max_entries=4, ttl=600, show_spinner=False)
+def _read_file_bytes(path: str, mtime: float) -> bytes:
+    """Contenu brut d'un fichier (mis en cache par (chemin, date de modification))
+
+    Borné à quelques fichiers récents, 10 min: pas de fichiers entiers conservés
+    en mémoire pendant toute la vie du serveur.
+    """
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@st.cache_resource(show_spinner=False)
+def _get_db_service():
+    """DatabaseService partagé entre les reruns (client Supabase sans état)"""
+    from modules.database_service import DatabaseService
+    return DatabaseService()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _fetch_recent_sessions(_client, limit: int = 10):
+    """Dernières sessions d'extraction (cache 30s; _client non hashé par Streamlit)"""
+    return _client.table("extraction_sessions")\
+        .select("*")\
+        .order("upload_date", desc=True)\
+        .limit(limit)\
+        .execute()\
+        .data
+
+
+# Nombre max de lignes renvoyées par requête PostgREST (défaut Supabase)
+_EXPORT_PAGE_SIZE = 1000
+
+# Tri unique de consolidated_export (une ligne par salle, room_id NULL pour un hôtel
+# sans salle): pages OFFSET/LIMIT stables et ordre des lignes identique d'un export à l'autre
+_EXPORT_ROW_ORDER = ('hotel_id', 'room_id')
+
+
+# Requêtes simultanées max vers Supabase pour le repli session par session
+_EXPORT_FETCH_CONCURRENCY = 10
+_EXPORT_FETCH_RETRIES = 3
+
+
+async def _fetch_consolidated_concurrently(url: str, key: str, session_ids: tuple) -> dict:
+    """Repli: requêtes REST par session, lancées en parallèle (concurrence bornée)
+
+    Chaque session est paginée (limit/offset) comme la requête groupée:
+    PostgREST plafonne une réponse à _EXPORT_PAGE_SIZE lignes.
+    """
+    endpoint = f"{url.rstrip('/')}/rest/v1/consolidated_export"
+    headers = {'apikey': key, 'Authorization': f"Bearer {key}"}
+    connector = aiohttp.TCPConnector(limit=_EXPORT_FETCH_CONCURRENCY)
+
+    async with aiohttp.ClientSession(connector=connector, headers=headers) as http:
+        async def fetch_page(session_id, offset):
+            params = {
+                'select': '*',
+                'session_id': f"eq.{session_id}",
+                'order': ','.join(_EXPORT_ROW_ORDER),
+                'limit': str(_EXPORT_PAGE_SIZE),
+                'offset': str(offset)
+            }
+            for attempt in range(1, _EXPORT_FETCH_RETRIES + 1):
+                async with http.get(endpoint, params=params) as response:
+                    # Rate limit Supabase: attendre avant de retenter
+                    if response.status == 429 and attempt < _EXPORT_FETCH_RETRIES:
+                        await asyncio.sleep(float(response.headers.get('Retry-After', attempt)))
+                        continue
+                    response.raise_for_status()
+                    return await response.json()
+
+        async def fetch_one(session_id):
+            rows, offset = [], 0
+            while True:
+                page = await fetch_page(session_id, offset)
+                rows.extend(page)
+                if len(page) < _EXPORT_PAGE_SIZE:
+                    return session_id, rows
+                offset += _EXPORT_PAGE_SIZE
+
+        return dict(await asyncio.gather(*(fetch_one(sid) for sid in session_ids)))
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _fetch_consolidated(_supabase, session_ids: tuple) -> dict:
+    """Lignes de consolidated_export pour toutes les sessions affichées
+
+    Une requête .in_ paginée au lieu d'une requête par session; les lignes
+    sont regroupées par session_id. Si la requête groupée échoue (volume,
+    timeout), repli sur des requêtes par session lancées en parallèle.
+    """
+    rows_by_session = {sid: [] for sid in session_ids}
+    start = 0
+    try:
+        while True:
+            query = _supabase.client.table("consolidated_export")\
+                .select("*")\
+                .in_("session_id", list(session_ids))\
+                .order("session_id")
+            for column in _EXPORT_ROW_ORDER:
+                query = query.order(column)
+            page = query.range(start, start + _EXPORT_PAGE_SIZE - 1).execute().data
+
+            for row in page:
+                rows_by_session[row['session_id']].append(row)
+
+            if len(page) < _EXPORT_PAGE_SIZE:
+                return rows_by_session
+            start += _EXPORT_PAGE_SIZE
+    except (APIError, httpx.HTTPError):
+        # Erreurs de requête uniquement: un bug ne doit pas basculer sur le repli
+        if len(session_ids) < 2:
+            raise
+        return asyncio.run(
+            _fetch_consolidated_concurrently(_supabase.url, _supabase.key, session_ids)
+        )
+
+
+class _NoExportRows(Exception):
+    """Aucune ligne consolidée pour la session (levée pour ne pas être mise en cache)"""
+
+
+def _session_csv_from_view(_db_service, session_id: str, include_empty_rooms: bool,
+                           session_ids: tuple = ()) -> str:
+    """CSV d'export d'une session depuis la vue consolidée
+
+    session_ids: sessions affichées, récupérées ensemble depuis la vue consolidée.
+    Lève _NoExportRows si la vue ne contient aucune ligne pour la session.
+    """
+    rows = _fetch_consolidated(
+        _db_service.client, session_ids or (session_id,)
+    ).get(session_id)
+    if not rows:
+        raise _NoExportRows(session_id)
+
+    df = pd.DataFrame(rows)
+
+    # Filtrer selon les options: un seul masque couvre NA et ''
+    if not include_empty_rooms:
+        df = df[df['nom_salle'].fillna('').ne('')]
+
+    # Writer pandas, comme export_session_to_csv: même format de fichier
+    # (True/False, 30.0, guillemets seulement si nécessaire) quel que soit le chemin
+    return df.to_csv(index=False)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _build_session_csv(_db_service, session_id: str, include_empty_rooms: bool,
+                       session_ids: tuple = ()) -> str:
+    """_session_csv_from_view mis en cache 5 min, réservé aux sessions terminées
+
+    Les échecs sont des exceptions: Streamlit ne les met jamais en cache.
+    """
+    return _session_csv_from_view(_db_service, session_id, include_empty_rooms, session_ids)
+
+
 class CSVExtractionPage:
     """Page d'extraction pour fichiers CSV"""
 
     def __init__(self):
         try:
-            self.extraction_service = ExtractionServiceDB()
+            # Reconstruit à chaque rerun (reprise d'une session active à l'init),
+            # seul le DatabaseService est partagé
+            self.extraction_service = ExtractionServiceDB(_get_db_service())
         except Exception as e:
             st.error(f"❌ Erreur initialisation service: {e}")
             st.info("🔧 Vérifiez votre configuration Supabase dans .env")
@@ -40,20 +281,7 @@ class CSVExtractionPage:
     def _handle_uploaded_file(self, uploaded_file):
         """Traite le fichier CSV uploadé"""
         try:
-            # Essayer différents encodages
-            encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
-            df = None
-            
-            for encoding in encodings:
-                try:
-                    uploaded_file.seek(0)  # Reset file pointer
-                    df = pd.read_csv(uploaded_file, encoding=encoding)
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-            if df is None:
-                raise ValueError("Impossible de décoder le fichier CSV. Veuillez le sauvegarder en UTF-8.")
+            df = self._get_parsed_csv(uploaded_file)
             
             if self._validate_csv_format(df):
                 self._show_csv_preview(df)
@@ -62,10 +290,30 @@ class CSVExtractionPage:
         except Exception as e:
             st.error(f"❌ Erreur lors de la lecture du fichier : {str(e)}")
     
+    @staticmethod
+    def _get_parsed_csv(uploaded_file):
+        """DataFrame du fichier uploadé, parsé une seule fois par upload
+
+        Conservé dans st.session_state sous le file_id de l'upload: les reruns
+        suivants n'ont ni à relire ni à hasher le contenu du fichier.
+        """
+        key = f"_parsed_csv_{uploaded_file.file_id}"
+        if key not in st.session_state:
+            # Nouvel upload: libérer le DataFrame du fichier précédent
+            previous_key = st.session_state.get('_parsed_csv_key')
+            if previous_key:
+                st.session_state.pop(previous_key, None)
+            
+            raw = uploaded_file.getvalue()
+            # Détection faite une seule fois par upload, comme le parsing
+            st.session_state[key] = _parse_csv(raw, _detect_encoding(raw))
+            st.session_state['_parsed_csv_key'] = key
+        
+        return st.session_state[key]
+    
     def _validate_csv_format(self, df):
         """Valide le format du CSV"""
-        required_columns = ['name', 'adresse', 'URL']
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = _missing_columns(df.columns)
         
         if missing_columns:
             st.error(f"❌ Colonnes manquantes dans le CSV : {', '.join(missing_columns)}")
@@ -78,7 +326,8 @@ class CSVExtractionPage:
     def _show_csv_preview(self, df):
         """Affiche l'aperçu du CSV"""
         with st.expander("👁️ Aperçu des données"):
-            st.dataframe(df.head())
+            # Seules les colonnes validées sont sérialisées vers le navigateur
+            st.dataframe(df.iloc[:5][list(_CSV_COLUMNS)], use_container_width=True)
     
     def _handle_extraction_options(self, df):
         """Gère les options d'extraction et lance le processus"""
@@ -105,7 +354,7 @@ class SingleURLExtractionPage:
 
     def __init__(self):
         try:
-            self.extraction_service = ExtractionServiceDB()
+            self.extraction_service = ExtractionServiceDB(_get_db_service())
         except Exception as e:
             st.error(f"❌ Erreur initialisation service: {e}")
             st.info("🔧 Vérifiez votre configuration Supabase dans .env")
@@ -216,14 +465,17 @@ class ResultsDisplayPage:
     @staticmethod
     def render_consolidation_results(consolidation_stats):
         """Affiche les résultats de consolidation"""
-        from ui.components import render_consolidation_metrics, render_consolidation_status_message
+        from ui.components import (
+            ConsolidationView, render_consolidation_metrics, render_consolidation_status_message
+        )
         
         st.subheader("📊 Résultats de consolidation")
         
-        render_consolidation_metrics(consolidation_stats)
-        render_consolidation_status_message(consolidation_stats)
+        view = ConsolidationView.from_stats(consolidation_stats)
+        render_consolidation_metrics(view)
+        render_consolidation_status_message(view)
         
-        if consolidation_stats['successful_extractions'] == 0:
+        if view.status == 'fail':
             ResultsDisplayPage._show_error_details(consolidation_stats)
             return
         
@@ -254,9 +506,11 @@ class ResultsDisplayPage:
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            st.info(f"**Fichier :** {os.path.basename(consolidation_stats['consolidation_file'])}")
-            st.info(f"**Colonnes :** {consolidation_stats.get('unique_columns', 0)} colonnes détectées")
-            st.info(f"**Date :** {consolidation_stats.get('consolidation_date', '')}")
+            st.info(
+                f"**Fichier :** {os.path.basename(consolidation_stats['consolidation_file'])}\n\n"
+                f"**Colonnes :** {consolidation_stats.get('unique_columns', 0)} colonnes détectées\n\n"
+                f"**Date :** {consolidation_stats.get('consolidation_date', '')}"
+            )
         
         with col2:
             ResultsDisplayPage._render_download_button(consolidation_stats)
@@ -265,13 +519,13 @@ class ResultsDisplayPage:
     def _render_download_button(consolidation_stats):
         """Affiche le bouton de téléchargement"""
         try:
-            with open(consolidation_stats['consolidation_file'], 'r', encoding='utf-8') as f:
-                csv_content = f.read()
+            path = consolidation_stats['consolidation_file']
+            csv_content = _read_file_bytes(path, os.path.getmtime(path))
             
             st.download_button(
                 label="📥 Télécharger le fichier consolidé",
                 data=csv_content,
-                file_name=os.path.basename(consolidation_stats['consolidation_file']),
+                file_name=os.path.basename(path),
                 mime="text/csv",
                 type="primary",
                 use_container_width=True
@@ -302,14 +556,14 @@ class ResultsDisplayPage:
             return
         
         with st.expander("📋 Détails par hôtel", expanded=False):
-            for hotel in consolidation_stats['hotels_with_data']:
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.write(f"**{hotel['name']}**")
-                with col2:
-                    st.write(f"{hotel['rooms_count']} salles")
-                with col3:
-                    st.write(f"Interface: {hotel['interface_type']}")
+            # Un seul tableau markdown plutôt que 3 appels Streamlit par hôtel
+            escape_pipes = str.maketrans({'|': r'\|'})
+            rows = "\n".join(
+                f"| **{str(hotel['name']).translate(escape_pipes)}** | {hotel['rooms_count']} salles "
+                f"| {hotel['interface_type']} |"
+                for hotel in consolidation_stats['hotels_with_data']
+            )
+            st.markdown(f"| Hôtel | Salles | Interface |\n|---|---|---|\n{rows}")
     
     @staticmethod
     def _show_error_summary(consolidation_stats):
@@ -318,17 +572,20 @@ class ResultsDisplayPage:
             return
         
         with st.expander(f"❌ Erreurs ({len(consolidation_stats['failed_hotels'])})", expanded=False):
-            for failed in consolidation_stats['failed_hotels']:
-                st.error(f"**{failed['name']}**: {failed['error']}")
+            st.error("\n\n".join(
+                f"**{failed['name']}**: {failed['error']}"
+                for failed in consolidation_stats['failed_hotels']
+            ))
 
 
 class ExportsPage:
     """Page dédiée aux exports CSV depuis Supabase"""
 
     def __init__(self):
+        self._session_ids = ()
+        self._session_statuses = {}
         try:
-            from modules.database_service import DatabaseService
-            self.db_service = DatabaseService()
+            self.db_service = _get_db_service()
         except Exception as e:
             st.error(f"❌ Erreur initialisation service: {e}")
             st.info("🔧 Vérifiez votre configuration Supabase dans .env")
@@ -356,7 +613,17 @@ class ExportsPage:
                     if watchdog_result == 0:
                         st.success("✅ Aucune session bloquée détectée")
                     # Les autres messages sont déjà affichés par _run_session_watchdog()
+                _fetch_recent_sessions.clear()
                 st.rerun()  # Recharger la page pour voir les changements
+        with col3:
+            # Les sessions sont mises en cache 30s entre les reruns
+            if st.button("🔄 Rafraîchir", help="Recharge la liste des sessions et les exports",
+                        use_container_width=True):
+                _fetch_recent_sessions.clear()
+                _fetch_consolidated.clear()
+                _build_session_csv.clear()
+                for key in [k for k in st.session_state if str(k).startswith('_export_csv_')]:
+                    del st.session_state[key]
 
         # Récupérer les 10 dernières sessions
         sessions = self._get_recent_sessions()
@@ -367,6 +634,9 @@ class ExportsPage:
             return
 
         # Afficher chaque session
+        # Les exports des sessions affichées sont récupérés en un seul lot
+        self._session_ids = tuple(session['id'] for session in sessions)
+        self._session_statuses = {session['id']: session.get('status') for session in sessions}
         for session in sessions:
             self._render_session_card(session)
 
@@ -413,20 +683,16 @@ class ExportsPage:
             # Export complet (données partielles)
             with col1:
                 if data_status['has_hotels']:
-                    csv_complete = self._generate_csv_from_view(session_id, include_empty_rooms=True)
-                    if csv_complete:
-                        st.download_button(
-                            label="📊 Récupérer données partielles",
-                            data=csv_complete,
-                            file_name=f"donnees_partielles_{session_id[:8]}_{timestamp}.csv",
-                            mime="text/csv",
-                            key=f"failed_complete_{session_id}",
-                            use_container_width=True,
-                            type="primary",
-                            help=f"Données récupérées: {data_status['total_hotels']} hôtels traités"
-                        )
-                    else:
-                        st.error("❌ Impossible de générer le CSV partiel")
+                    self._render_lazy_download(
+                        session_id,
+                        include_empty_rooms=True,
+                        label="📊 Récupérer données partielles",
+                        file_name=f"donnees_partielles_{session_id[:8]}_{timestamp}.csv",
+                        key=f"failed_complete_{session_id}",
+                        button_type="primary",
+                        help_text=f"Données récupérées: {data_status['total_hotels']} hôtels traités",
+                        error_message="❌ Impossible de générer le CSV partiel"
+                    )
                 else:
                     st.button("📊 Récupérer données partielles", disabled=True, use_container_width=True)
                     st.caption("Aucune donnée")
@@ -434,20 +700,16 @@ class ExportsPage:
             # Export salles seulement (si disponible)
             with col2:
                 if data_status['has_rooms']:
-                    csv_rooms_only = self._generate_csv_from_view(session_id, include_empty_rooms=False)
-                    if csv_rooms_only:
-                        st.download_button(
-                            label="🏢 Salles récupérées",
-                            data=csv_rooms_only,
-                            file_name=f"salles_partielles_{session_id[:8]}_{timestamp}.csv",
-                            mime="text/csv",
-                            key=f"failed_rooms_{session_id}",
-                            use_container_width=True,
-                            type="secondary",
-                            help=f"Salles récupérées: {data_status['total_rooms']} salles"
-                        )
-                    else:
-                        st.error("❌ Impossible de générer le CSV salles")
+                    self._render_lazy_download(
+                        session_id,
+                        include_empty_rooms=False,
+                        label="🏢 Salles récupérées",
+                        file_name=f"salles_partielles_{session_id[:8]}_{timestamp}.csv",
+                        key=f"failed_rooms_{session_id}",
+                        button_type="secondary",
+                        help_text=f"Salles récupérées: {data_status['total_rooms']} salles",
+                        error_message="❌ Impossible de générer le CSV salles"
+                    )
                 else:
                     st.button("🏢 Salles récupérées", disabled=True, use_container_width=True)
                     st.caption("Aucune salle récupérée")
@@ -459,13 +721,7 @@ class ExportsPage:
     def _get_recent_sessions(self):
         """Récupère les 10 dernières sessions d'extraction"""
         try:
-            result = self.db_service.client.client.table("extraction_sessions")\
-                .select("*")\
-                .order("upload_date", desc=True)\
-                .limit(10)\
-                .execute()
-
-            return result.data
+            return _fetch_recent_sessions(self.db_service.client.client)
         except Exception as e:
             st.error(f"❌ Erreur récupération sessions: {e}")
             return []
@@ -518,11 +774,7 @@ class ExportsPage:
 
             with col3:
                 status = session.get('status', 'unknown')
-                status_emoji = {
-                    'completed': '✅',
-                    'processing': '⏳',
-                    'failed': '❌'
-                }.get(status, '❓')
+                status_emoji = _STATUS_EMOJI.get(status, '❓')
 
                 # Affichage intelligent du statut
                 if status == 'processing':
@@ -596,20 +848,16 @@ class ExportsPage:
             # Export complet - toujours disponible s'il y a des hôtels
             with col1:
                 if data_status['has_hotels']:
-                    csv_complete = self._generate_csv_from_view(session_id, include_empty_rooms=True)
-                    if csv_complete:
-                        st.download_button(
-                            label="📊 Export Complet",
-                            data=csv_complete,
-                            file_name=f"export_complet_{session_id[:8]}_{timestamp}.csv",
-                            mime="text/csv",
-                            key=f"complete_{session_id}",
-                            use_container_width=True,
-                            type="primary",
-                            help=f"Tous les hôtels ({data_status['total_hotels']} hôtels)"
-                        )
-                    else:
-                        st.error("❌ Échec génération CSV complet")
+                    self._render_lazy_download(
+                        session_id,
+                        include_empty_rooms=True,
+                        label="📊 Export Complet",
+                        file_name=f"export_complet_{session_id[:8]}_{timestamp}.csv",
+                        key=f"complete_{session_id}",
+                        button_type="primary",
+                        help_text=f"Tous les hôtels ({data_status['total_hotels']} hôtels)",
+                        error_message="❌ Échec génération CSV complet"
+                    )
                 else:
                     st.button("📊 Export Complet", disabled=True, use_container_width=True)
                     st.caption("Aucune donnée")
@@ -617,20 +865,16 @@ class ExportsPage:
             # Export salles seulement
             with col2:
                 if data_status['has_rooms']:
-                    csv_rooms_only = self._generate_csv_from_view(session_id, include_empty_rooms=False)
-                    if csv_rooms_only:
-                        st.download_button(
-                            label="🏢 Export Salles",
-                            data=csv_rooms_only,
-                            file_name=f"salles_seulement_{session_id[:8]}_{timestamp}.csv",
-                            mime="text/csv",
-                            key=f"rooms_{session_id}",
-                            use_container_width=True,
-                            type="secondary",
-                            help=f"Hôtels avec salles ({data_status['total_rooms']} salles)"
-                        )
-                    else:
-                        st.error("❌ Échec génération CSV salles")
+                    self._render_lazy_download(
+                        session_id,
+                        include_empty_rooms=False,
+                        label="🏢 Export Salles",
+                        file_name=f"salles_seulement_{session_id[:8]}_{timestamp}.csv",
+                        key=f"rooms_{session_id}",
+                        button_type="secondary",
+                        help_text=f"Hôtels avec salles ({data_status['total_rooms']} salles)",
+                        error_message="❌ Échec génération CSV salles"
+                    )
                 else:
                     st.button("🏢 Export Salles", disabled=True, use_container_width=True)
                     st.caption("Aucune salle disponible")
@@ -640,6 +884,38 @@ class ExportsPage:
             # Afficher plus de détails pour le debugging
             st.caption(f"💾 Debug: Session {session_id[:8]} - {data_status['total_hotels']} hôtels, {data_status['total_rooms']} salles")
 
+    def _render_lazy_download(self, session_id, include_empty_rooms, label, file_name,
+                              key, button_type, help_text, error_message):
+        """Génère le CSV seulement au clic, puis affiche le bouton de téléchargement
+
+        Le CSV d'une session terminée est conservé dans st.session_state pour les
+        reruns suivants; les autres sont régénérés à chaque préparation.
+        """
+        state_key = f"_export_csv_{key}"
+        csv_data = st.session_state.get(state_key)
+        if csv_data is None:
+            if not st.button(f"⚙️ Préparer · {label}", key=f"prep_{key}",
+                             use_container_width=True, type=button_type, help=help_text):
+                return
+            csv_data, keep = self._generate_csv_from_view(session_id, include_empty_rooms)
+            if not csv_data:
+                # Rien de conservé: le bouton Préparer permet une nouvelle tentative
+                st.error(error_message)
+                return
+            if keep:
+                st.session_state[state_key] = csv_data
+
+        st.download_button(
+            label=label,
+            data=csv_data,
+            file_name=file_name,
+            mime="text/csv",
+            key=key,
+            use_container_width=True,
+            type=button_type,
+            help=help_text
+        )
+
     def _diagnose_session_data(self, session_id):
         """Diagnostique l'état des données pour une session"""
         try:
@@ -686,31 +962,29 @@ class ExportsPage:
             }
 
     def _generate_csv_from_view(self, session_id, include_empty_rooms=True):
-        """Génère le CSV depuis la vue consolidée"""
+        """Génère le CSV depuis la vue consolidée
+
+        Returns:
+            tuple: (CSV ou None, True si le CSV peut être conservé entre les reruns)
+        """
+        session_ids = self._session_ids if session_id in self._session_ids else ()
+        completed = self._session_statuses.get(session_id) == 'completed'
         try:
             # Utiliser la vue consolidée si elle existe
             try:
-                result = self.db_service.client.client.table("consolidated_export")\
-                    .select("*")\
-                    .eq("session_id", session_id)\
-                    .execute()
-
-                if result.data:
-                    df = pd.DataFrame(result.data)
-
-                    # Filtrer selon les options
-                    if not include_empty_rooms:
-                        df = df[df['nom_salle'].notna() & (df['nom_salle'] != '')]
-
-                    return df.to_csv(index=False, encoding='utf-8')
-
+                if completed:
+                    return _build_session_csv(self.db_service, session_id, include_empty_rooms, session_ids), True
+                # Session en cours ou échouée: données encore susceptibles de changer, pas de cache
+                return _session_csv_from_view(self.db_service, session_id, include_empty_rooms, session_ids), False
+            except _NoExportRows:
+                return None, False
             except Exception:
                 # Fallback sur l'ancienne méthode si la vue n'existe pas
+                # (jamais conservé: peut être un CSV d'erreur)
                 return self.db_service.export_session_to_csv(
                     session_id=session_id,
                     include_empty_rooms=include_empty_rooms
-                )
-
+                ), False
         except Exception as e:
             st.error(f"Erreur export CSV: {e}")
-            return None 
\ No newline at end of file
+            return None, False
@@ -8,6 +8,8 @@ from .http_client import (
     http_session, 
     close_http_client,
     http_get,
+    http_get_shared,
+    http_head,
     http_post, 
     http_request
 )
@@ -18,6 +20,8 @@ __all__ = [
     'http_session',
     'close_http_client',
     'http_get',
+    'http_get_shared',
+    'http_head',
     'http_post',
     'http_request'
 ]
\ No newline at end of file
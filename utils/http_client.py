@@ -4,11 +4,156 @@ Client HTTP centralisé avec connection pooling pour optimiser les performances
 
 import aiohttp
 import asyncio
-from typing import Optional, Dict, Any
+import logging
+import socket
+import time
+from types import ModuleType
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple
 from contextlib import asynccontextmanager
+from aiohttp.abc import ResolveResult
 
 from config.settings import settings
 
+logger = logging.getLogger(__name__)
+
+aiodns: Optional[ModuleType]
+try:
+    import aiodns  # Résolution DNS asynchrone (c-ares) pour aiohttp.AsyncResolver
+except ImportError:
+    aiodns = None
+
+httpx: Optional[ModuleType]
+try:
+    import httpx  # Client HTTP/2 optionnel (HTTPClientManager.get_http2_client)
+except ImportError:
+    httpx = None
+
+if TYPE_CHECKING:
+    from httpx import Response as HttpxResponse
+
+
+# En-têtes par défaut, communs à toutes les sessions
+_DEFAULT_HEADERS = {
+    'User-Agent': 'HotelScraper/1.0 (Professional Data Extraction)'
+}
+
+
+def _tcp_socket_factory(addr_info) -> socket.socket:
+    """Crée le socket TCP avec TCP_NODELAY et SO_KEEPALIVE déjà positionnés"""
+    family, type_, proto, _, _ = addr_info
+    sock = socket.socket(family=family, type=type_, proto=proto)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    return sock
+
+
+class CachedResolver(aiohttp.abc.AbstractResolver):
+    """Resolver DNS avec cache des échecs et réponse de secours
+    
+    Les échecs (NXDOMAIN, timeout) sont mémorisés NEGATIVE_TTL secondes pour ne
+    pas relancer la même requête DNS à chaque scrape d'un hôte mort. Si un hôte
+    déjà résolu échoue ponctuellement, la dernière réponse valide reste servie
+    pendant GRACE_TTL secondes. Une réponse de moins de POSITIVE_TTL secondes
+    est servie sans nouvelle requête (hôtes préchauffés par warmup()). Les
+    entrées expirées sont purgées au plus une fois par NEGATIVE_TTL: pas une
+    entrée par hôte conservée indéfiniment.
+    """
+    
+    NEGATIVE_TTL = 60.0
+    POSITIVE_TTL = 120.0
+    GRACE_TTL = 300.0
+    
+    def __init__(self, resolver: aiohttp.abc.AbstractResolver):
+        self._resolver = resolver
+        self._failures: Dict[Tuple[str, int], float] = {}
+        self._last_good: Dict[Tuple[str, int, int], Tuple[float, List[ResolveResult]]] = {}
+        self._next_prune = 0.0
+    
+    async def resolve(self, host: str, port: int = 0,
+                      family: socket.AddressFamily = socket.AF_INET) -> List[ResolveResult]:
+        host = host.lower()
+        key = (host, family)
+        now = time.monotonic()
+        self._prune(now)
+        
+        failed_at = self._failures.get(key)
+        if failed_at is not None:
+            if now - failed_at < self.NEGATIVE_TTL:
+                raise OSError(f"Résolution DNS de {host} en échec récent (cache négatif)")
+            del self._failures[key]
+        
+        last_good = self._last_good.get((host, port, family))
+        if last_good and now - last_good[0] < self.POSITIVE_TTL:
+            return last_good[1]
+        
+        try:
+            hosts = await self._resolver.resolve(host, port, family)
+        except OSError:
+            if last_good and now - last_good[0] < self.GRACE_TTL:
+                return last_good[1]
+            self._failures[key] = now
+            raise
+        
+        self._last_good[(host, port, family)] = (now, hosts)
+        return hosts
+    
+    def _prune(self, now: float) -> None:
+        """Retire les échecs et réponses de secours expirés"""
+        if now < self._next_prune:
+            return
+        self._next_prune = now + self.NEGATIVE_TTL
+        self._failures = {
+            key: failed_at for key, failed_at in self._failures.items()
+            if now - failed_at < self.NEGATIVE_TTL
+        }
+        self._last_good = {
+            key: entry for key, entry in self._last_good.items()
+            if now - entry[0] < self.GRACE_TTL
+        }
+    
+    async def close(self) -> None:
+        await self._resolver.close()
+
+
+class Http2Client:
+    """Client httpx HTTP/2, API distincte des méthodes aiohttp du manager
+    
+    Les requêtes vers un même hôte sont multiplexées sur une seule connexion
+    TCP+TLS au lieu d'un pool de connexions HTTP/1.1. Retourne des
+    httpx.Response (status_code, json() synchrone, corps déjà lu).
+    """
+    
+    def __init__(self, timeout: aiohttp.ClientTimeout):
+        if httpx is None:
+            raise RuntimeError("httpx requis pour le client HTTP/2 (pip install 'httpx[http2]')")
+        
+        self._client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=30),
+            timeout=httpx.Timeout(timeout.sock_read, connect=timeout.sock_connect),
+            headers=dict(_DEFAULT_HEADERS),
+            follow_redirects=True
+        )
+        # httpx n'a pas de délai global: appliqué autour de chaque requête
+        self._total_timeout = timeout.total
+    
+    async def request(self, method: str, url: str, **kwargs) -> "HttpxResponse":
+        async with asyncio.timeout(self._total_timeout):
+            return await self._client.request(method, url, **kwargs)
+    
+    async def get(self, url: str, **kwargs) -> "HttpxResponse":
+        return await self.request("GET", url, **kwargs)
+    
+    async def post(self, url: str, **kwargs) -> "HttpxResponse":
+        return await self.request("POST", url, **kwargs)
+    
+    @property
+    def closed(self) -> bool:
+        return self._client.is_closed
+    
+    async def close(self) -> None:
+        await self._client.aclose()
+
 
 class HTTPClientManager:
     """Gestionnaire centralisé des clients HTTP avec pooling de connexions"""
@@ -16,93 +161,294 @@ class HTTPClientManager:
     def __init__(self):
         self._session: Optional[aiohttp.ClientSession] = None
         self._lock = asyncio.Lock()
+        # Positionné par close(): bloque toute (re)création de session
+        self._closing = False
+        # Méthodes liées de la session courante (évite la résolution d'attribut par appel)
+        self._get = self._post = self._request = None
+        # Resolver et connecteur partagés entre les sessions successives d'une même
+        # boucle: cache DNS et connexions keep-alive survivent à une recréation
+        self._resolver: Optional[CachedResolver] = None
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        # Boucle à laquelle connecteur et resolver (aiodns) sont rattachés
+        self._connector_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Client HTTP/2 créé à la demande (get_http2_client)
+        self._http2: Optional[Http2Client] = None
+        # Préchauffage DNS lancé en tâche de fond à la première session
+        self._warmup_task: Optional[asyncio.Task] = None
+        # GET en cours, partagés entre appelants concurrents (get_shared)
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        
+        # Compteurs de connexions alimentés par les hooks de trace aiohttp
+        self._created_connections = 0
+        self._reused_connections = 0
+        self._trace_config = aiohttp.TraceConfig()
+        self._trace_config.on_connection_create_end.append(self._on_connection_created)
+        self._trace_config.on_connection_reuseconn.append(self._on_connection_reused)
         
         # Configuration optimisée pour performance
         self._connector_config = {
             'limit': 100,  # Limite totale de connexions
-            'limit_per_host': 30,  # Limite par host
+            # Limite par host: 0 par défaut, aiohttp n'a alors aucun compteur par
+            # host à maintenir à chaque acquisition/libération de connexion
+            'limit_per_host': settings.http.limit_per_host,
             'ttl_dns_cache': 10 * 60,  # Cache DNS 10 minutes
             'use_dns_cache': True,
             'keepalive_timeout': 30,  # Keep-alive 30s
-            'enable_cleanup_closed': True
+            # Uniquement utile pour la fuite SSL des anciens Python (timer toutes les 2s)
+            'enable_cleanup_closed': settings.http.enable_cleanup_closed,
+            # Options du socket posées une fois à sa création
+            'socket_factory': _tcp_socket_factory
+            # ssl non précisé: aiohttp partage déjà un SSLContext vérifié unique
+            # (chargé à l'import, ALPN http/1.1) entre tous les connecteurs
         }
+        if settings.http.force_ipv4:
+            # Pas d'enregistrements AAAA tentés: aucune attente Happy Eyeballs
+            self._connector_config['family'] = socket.AF_INET
+        else:
+            # Happy Eyeballs (RFC 8305): 50ms avant de tenter la famille suivante
+            # au lieu de 250ms, en alternant IPv6/IPv4
+            self._connector_config['happy_eyeballs_delay'] = 0.05
+            self._connector_config['interleave'] = 1
         
         self._timeout_config = {
             'total': 30,  # Timeout total par défaut
-            'connect': 10,  # Timeout connexion
+            # Timeout de connexion TCP uniquement: aucun timer armé quand une
+            # connexion keep-alive du pool est réutilisée (aiohttp >= 3.11)
+            'sock_connect': 10,
             'sock_read': 20  # Timeout lecture
         }
+        # Construit une seule fois, partagé par les sessions successives et
+        # réutilisable par les appelants (ex. timeout=client.default_timeout)
+        self.default_timeout = aiohttp.ClientTimeout(**self._timeout_config)
     
     async def get_session(self) -> aiohttp.ClientSession:
         """Retourne la session HTTP réutilisable (singleton)"""
-        if self._session is None or self._session.closed:
-            async with self._lock:
-                if self._session is None or self._session.closed:
-                    await self._create_session()
+        # Chemin rapide: session prête, aucun verrou
+        session = self._session
+        if session is not None and not session.closed and not self._closing:
+            return session
+        
+        # Création (ou recréation) sérialisée: un seul créateur concurrent
+        async with self._lock:
+            if self._closing:
+                raise RuntimeError("HTTPClientManager fermé: aucune nouvelle requête acceptée")
+            if self._session is None or self._session.closed:
+                await self._create_session()
+                if settings.http.warmup_hosts and self._warmup_task is None:
+                    # En tâche de fond: ne retarde pas la requête en cours
+                    self._warmup_task = asyncio.create_task(self.warmup())
         
         return self._session
     
+    async def warmup(self, hosts: Optional[List[str]] = None, open_connections: bool = False) -> int:
+        """Pré-résout des hôtes fréquents dans le resolver partagé du connecteur
+        
+        Args:
+            hosts: Hôtes à préchauffer (défaut: settings.http.warmup_hosts)
+            open_connections: Ouvre aussi une connexion TLS par hôte (HEAD /)
+                pour amorcer le pool keep-alive
+        
+        Returns:
+            int: Nombre d'hôtes préchauffés avec succès
+        """
+        hosts = list(hosts if hosts is not None else settings.http.warmup_hosts)
+        if not hosts:
+            return 0
+        
+        session = await self.get_session()
+        # Même famille que les résolutions du connecteur: l'entrée en cache lui servira
+        family = self._connector_config.get('family', socket.AF_UNSPEC)
+        
+        async def warm(host: str) -> bool:
+            try:
+                if open_connections:
+                    async with session.head(f"https://{host}/", allow_redirects=False):
+                        pass
+                else:
+                    # Réponse servie par CachedResolver pendant POSITIVE_TTL
+                    await self._get_resolver().resolve(host, 443, family)
+                return True
+            except (aiohttp.ClientError, OSError, asyncio.TimeoutError) as e:
+                logger.debug("Préchauffage de %s ignoré: %s", host, e)
+                return False
+        
+        warmed = sum(await asyncio.gather(*(warm(host) for host in hosts)))
+        logger.info("🔥 Préchauffage HTTP: %d/%d hôtes", warmed, len(hosts))
+        return warmed
+    
+    def _get_resolver(self) -> aiohttp.abc.AbstractResolver:
+        """Resolver DNS partagé: aiodns si disponible, avec cache des échecs"""
+        if self._resolver is None:
+            # Créé dans la boucle courante: aiodns s'y rattache
+            base = aiohttp.AsyncResolver() if aiodns is not None else aiohttp.ThreadedResolver()
+            self._resolver = CachedResolver(base)
+        return self._resolver
+    
     async def _create_session(self):
-        """Crée une nouvelle session HTTP optimisée"""
-        connector = aiohttp.TCPConnector(**self._connector_config)
-        timeout = aiohttp.ClientTimeout(**self._timeout_config)
+        """Crée une nouvelle session HTTP optimisée
+        
+        Connecteur et resolver sont liés à la boucle qui les a créés: une session
+        recréée dans une autre boucle (nouvel asyncio.run) en construit de nouveaux.
+        """
+        loop = asyncio.get_running_loop()
+        if self._connector_loop is not loop:
+            # Ressources de l'ancienne boucle (souvent déjà fermée): abandonnées,
+            # leur fermeture exigerait cette boucle
+            self._connector = None
+            self._resolver = None
+            self._warmup_task = None
+            self._connector_loop = loop
+        
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(resolver=self._get_resolver(), **self._connector_config)
         
         self._session = aiohttp.ClientSession(
-            connector=connector,
-            timeout=timeout,
-            headers={
-                'User-Agent': 'HotelScraper/1.0 (Professional Data Extraction)'
-            },
-            # Cookies automatiques pour sessions
-            cookie_jar=aiohttp.CookieJar()
+            connector=self._connector,
+            # Le connecteur appartient au manager: fermer la session ne le ferme pas
+            connector_owner=False,
+            timeout=self.default_timeout,
+            headers=_DEFAULT_HEADERS,
+            trace_configs=[self._trace_config],
+            # Cookies uniquement si demandés: DummyCookieJar évite le parsing des
+            # Set-Cookie et le filtrage par URL à chaque requête
+            cookie_jar=(
+                aiohttp.CookieJar(quote_cookie=False) if settings.http.use_cookies
+                else aiohttp.DummyCookieJar()
+            )
         )
         
-        print(f"🔗 Session HTTP créée avec connection pooling")
-        print(f"   📊 Limites: {self._connector_config['limit']} total, {self._connector_config['limit_per_host']}/host")
+        self._get = self._session.get
+        self._post = self._session.post
+        self._request = self._session.request
+        
+        if self is _http_manager:
+            # Raccourci lu directement par http_get/http_post/http_request
+            global _http_session_fast
+            _http_session_fast = self._session
+        
+        logger.info(
+            "🔗 Session HTTP créée avec connection pooling (limites: %d total, %d/host)",
+            self._connector_config['limit'], self._connector_config['limit_per_host']
+        )
     
     async def close(self):
-        """Ferme proprement la session HTTP"""
-        if self._session and not self._session.closed:
-            await self._session.close()
-            print("🔒 Session HTTP fermée")
+        """Ferme proprement la session HTTP
+        
+        Définitif: le manager refuse ensuite toute nouvelle requête
+        (close_http_client() en recrée un au besoin).
+        """
+        # Sous le verrou de création: aucune session ne peut renaître pendant
+        # la fermeture, les créateurs en attente verront _closing
+        async with self._lock:
+            self._closing = True
+            
+            if self._warmup_task is not None:
+                self._warmup_task.cancel()
+                self._warmup_task = None
+            
+            self._get = self._post = self._request = None
+            if self._session and not self._session.closed:
+                await self._session.close()
+                logger.info("🔒 Session HTTP fermée")
+            
+            if self._http2 is not None:
+                await self._http2.close()
+                self._http2 = None
+            
+            if self._connector is not None:
+                # Remis à None seulement une fois fermé
+                await self._connector.close()
+                self._connector = None
+            
+            if self._resolver is not None:
+                await self._resolver.close()
+                self._resolver = None
     
     async def get(self, url: str, **kwargs) -> aiohttp.ClientResponse:
         """GET request avec session poolée"""
-        session = await self.get_session()
-        return await session.get(url, **kwargs)
+        session = self._session
+        if session is None or session.closed or self._closing:
+            await self.get_session()
+        return await self._get(url, **kwargs)
     
     async def post(self, url: str, **kwargs) -> aiohttp.ClientResponse:
         """POST request avec session poolée"""
-        session = await self.get_session()
-        return await session.post(url, **kwargs)
+        session = self._session
+        if session is None or session.closed or self._closing:
+            await self.get_session()
+        return await self._post(url, **kwargs)
     
     async def request(self, method: str, url: str, **kwargs) -> aiohttp.ClientResponse:
         """Request générique avec session poolée"""
-        session = await self.get_session()
-        return await session.request(method, url, **kwargs)
+        session = self._session
+        if session is None or session.closed or self._closing:
+            await self.get_session()
+        return await self._request(method, url, **kwargs)
+    
+    def get_http2_client(self) -> Http2Client:
+        """Client HTTP/2 (httpx) partagé, pour les hôtes qui le supportent
+        
+        API séparée de get/post/request, qui retournent toujours des
+        aiohttp.ClientResponse: les réponses sont ici des httpx.Response.
+        """
+        if self._closing:
+            raise RuntimeError("HTTPClientManager fermé: aucune nouvelle requête acceptée")
+        if self._http2 is None or self._http2.closed:
+            self._http2 = Http2Client(self.default_timeout)
+        return self._http2
+    
+    async def get_shared(self, url: str, **kwargs) -> Tuple[int, Any, bytes]:
+        """GET dédupliqué: les appels concurrents identiques partagent une requête
+        
+        Une réponse ne pouvant être lue qu'une fois, retourne (status, headers, body).
+        Un appelant annulé (timeout) n'annule pas la requête des autres.
+        """
+        key = (url, repr(sorted(kwargs.items())))
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(url, **kwargs))
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._forget_inflight(key, done))
+        return await asyncio.shield(future)
+    
+    def _forget_inflight(self, key: Tuple[str, str], done: asyncio.Future) -> None:
+        """Retire un GET terminé du cache des requêtes en cours"""
+        self._inflight.pop(key, None)
+        if not done.cancelled():
+            # Marque l'exception comme lue même si tous les appelants ont abandonné
+            done.exception()
+    
+    async def _fetch(self, url: str, **kwargs) -> Tuple[int, Any, bytes]:
+        """GET complet (corps lu) pour get_shared"""
+        async with await self.get(url, **kwargs) as response:
+            return response.status, response.headers, await response.read()
+    
+    async def _on_connection_created(self, session, trace_context, params) -> None:
+        self._created_connections += 1
+    
+    async def _on_connection_reused(self, session, trace_context, params) -> None:
+        self._reused_connections += 1
     
     def get_connection_stats(self) -> Dict[str, Any]:
-        """Retourne les statistiques de connexion"""
+        """Retourne les statistiques de connexion (compteurs O(1), sans internals aiohttp)"""
         if not self._session or self._session.closed:
             return {'status': 'no_session'}
         
-        connector = self._session.connector
-        if hasattr(connector, '_conns'):
-            return {
-                'status': 'active',
-                'total_connections': len(connector._conns),
-                'acquired_connections': sum(len(conns) for conns in connector._conns.values()),
-                'connector_config': self._connector_config
-            }
-        
-        return {'status': 'active', 'details': 'unavailable'}
+        return {
+            'status': 'active',
+            'created_connections': self._created_connections,
+            'reused_connections': self._reused_connections,
+            'connector_config': self._connector_config
+        }
 
 
 # Instance globale pour réutilisation
 _http_manager: Optional[HTTPClientManager] = None
+# Session de l'instance globale une fois créée (évite get_http_client/get_session par appel)
+_http_session_fast: Optional[aiohttp.ClientSession] = None
 
-async def get_http_client() -> HTTPClientManager:
-    """Retourne l'instance globale du client HTTP"""
+def get_http_client() -> HTTPClientManager:
+    """Retourne l'instance globale du client HTTP (synchrone: simple lecture du singleton)"""
     global _http_manager
     if _http_manager is None:
         _http_manager = HTTPClientManager()
@@ -111,7 +457,7 @@ async def get_http_client() -> HTTPClientManager:
 @asynccontextmanager
 async def http_session():
     """Context manager pour obtenir une session HTTP poolée"""
-    client = await get_http_client()
+    client = get_http_client()
     session = await client.get_session()
     try:
         yield session
@@ -121,7 +467,8 @@ async def http_session():
 
 async def close_http_client():
     """Ferme le client HTTP global"""
-    global _http_manager
+    global _http_manager, _http_session_fast
+    _http_session_fast = None
     if _http_manager:
         await _http_manager.close()
         _http_manager = None
@@ -130,15 +477,38 @@ async def close_http_client():
 # Fonctions utilitaires pour remplacer aiohttp direct
 async def http_get(url: str, **kwargs):
     """GET request optimisé avec pooling"""
-    client = await get_http_client()
-    return await client.get(url, **kwargs)
+    session = _http_session_fast
+    if session is None or session.closed:
+        return await get_http_client().get(url, **kwargs)
+    return await session.get(url, **kwargs)
+
+async def http_get_shared(url: str, **kwargs):
+    """GET dédupliqué entre appels concurrents, retourne (status, headers, body)"""
+    return await get_http_client().get_shared(url, **kwargs)
+
+async def http_head(url: str, **kwargs) -> Tuple[int, Any]:
+    """Sonde de disponibilité: HEAD sans redirection, retourne (status, headers)
+    
+    À utiliser plutôt qu'un GET dont le corps est ignoré: aucun corps n'est
+    transféré ni lu, et la connexion retourne aussitôt au pool.
+    """
+    session = _http_session_fast
+    if session is None or session.closed:
+        session = await get_http_client().get_session()
+    kwargs.setdefault('allow_redirects', False)
+    async with session.head(url, **kwargs) as response:
+        return response.status, response.headers
 
 async def http_post(url: str, **kwargs):
     """POST request optimisé avec pooling"""
-    client = await get_http_client()
-    return await client.post(url, **kwargs)
+    session = _http_session_fast
+    if session is None or session.closed:
+        return await get_http_client().post(url, **kwargs)
+    return await session.post(url, **kwargs)
 
 async def http_request(method: str, url: str, **kwargs):
     """Request générique optimisé avec pooling"""
-    client = await get_http_client()
-    return await client.request(method, url, **kwargs)
\ No newline at end of file
+    session = _http_session_fast
+    if session is None or session.closed:
+        return await get_http_client().request(method, url, **kwargs)
+    return await session.request(method, url, **kwargs)